@@ -1,4 +1,4 @@
-from .filter import filter_papers
+from .filter import filter_papers, filter_papers_mask
 from .scanner import scan_arxiv_metadata
 from .arxiv_download import download_arxiv_papers
 from .analyzer import analyze_papers
\ No newline at end of file
@@ -1,5 +1,5 @@
 import sys
-import time
+import asyncio
 import pandas as pd
 from tqdm import tqdm
 from pathlib import Path
@@ -23,6 +23,8 @@ def analyze_papers(google_keys: Dict[str, str], config: dict, papers: List[Arxiv
     # Extract information using Gemini LLM via Vertex AI
     # PDFs are uploaded to Gemini File API and analyzed with multimodal capabilities
     max_llm_calls = config.get('max_llm_calls', -1)
+    max_concurrency = config.get('max_concurrency', 8)
+    batch_size = config.get('batch_size', 1)
     
     # get model name
     model_name = config.get("model_name", "gemini-2.5-flash")
@@ -41,12 +43,18 @@ def analyze_papers(google_keys: Dict[str, str], config: dict, papers: List[Arxiv
     papers_to_process = papers[:max_llm_calls] if max_llm_calls != -1 else papers
     print(f"\nExtracting from {len(papers_to_process)} papers using {model_name}...")
 
-    # LLM extraction loop
+    # LLM extraction, with up to max_concurrency requests in flight
+    with tqdm(total=len(papers_to_process), desc="Extracting", unit="papers") as pbar:
+        entries = asyncio.run(client.analyze_papers_from_pdf(
+            papers_to_process, config,
+            max_concurrency=max_concurrency,
+            batch_size=batch_size,
+            on_complete=lambda pdf_paper, entry: pbar.update()
+        ))
+
     results = []
-    for pdf_paper in tqdm(papers_to_process, desc="Extracting", unit="papers"):
+    for pdf_paper, entry in zip(papers_to_process, entries):
         try:
-            # PDF mode: upload PDF to Gemini and analyze
-            entry = client.analyze_paper_from_pdf(pdf_paper, config)
             print(f"Extracted Entry: {entry}\n")
             
             if entry and entry.metric_value is not None:
@@ -64,7 +72,6 @@ def analyze_papers(google_keys: Dict[str, str], config: dict, papers: List[Arxiv
                     "Evidence": entry.evidence,
                     "Dataset Mentioned": entry.dataset_mentioned,
                 })
-                time.sleep(0.1) 
                 
         except Exception as e:
             # catch exceptions
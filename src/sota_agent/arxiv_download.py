@@ -1,18 +1,20 @@
+import os
 import json
 import time
 from tqdm import tqdm
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Sequence
 
 from sota_agent.model.pdf_paper import ArxivPdfPaper
-from sota_agent.utils.pdf_fetcher import fetch_paper_from_arxiv
+from sota_agent.utils.pdf_fetcher import fetch_paper_from_arxiv, extract_text_from_pdf
 
 
-def download_arxiv_papers(config: Dict[str, Any], candidates: List[Dict[str, Any]], paths: Dict[str, Any]):
+def download_arxiv_papers(config: Dict[str, Any], candidates: Sequence[Dict[str, Any]], paths: Dict[str, Any]):
     """
     Function to download ArXiv papers as PDFs and save as ArxivPdfPaper objects.
     Params:
         config: ARXIV_DOWNLOAD_PARAMETERS from YAML config.
-        candidates: List of candidate paper metadata dicts from step 1.
+        candidates: Candidate paper metadata dicts from step 1 (e.g. ArxivCandidates).
         paths: Dictionary of predetermined file paths.
     Returns:
         List of downloaded and parsed ArxivPdfPaper objects.
@@ -30,6 +32,8 @@ def download_arxiv_papers(config: Dict[str, Any], candidates: List[Dict[str, Any
     # get params
     keep_pdf = config.get('save_files', False)
     save_parsed = config.get('save_parsed_papers', True)
+    extract_workers = config.get('extract_workers', -1)
+    n_extract_workers = (os.cpu_count() or 1) if extract_workers == -1 else extract_workers
     
     # Make sure directories exist
     if save_parsed:
@@ -44,45 +48,56 @@ def download_arxiv_papers(config: Dict[str, Any], candidates: List[Dict[str, Any
             failed_downloads = set(json.load(f))
     
     pdf_papers = []
-    for paper_metadata in tqdm(papers_to_process, desc="Downloading PDFs", unit="papers"):
-        arxiv_id = paper_metadata.get('id')
-        if arxiv_id:
-            # Skip if previously failed
-            if arxiv_id in failed_downloads:
-                tqdm.write(f"Skipping {arxiv_id} (previously failed)")
-                continue
-            
-            # Check if parsed PDF paper already exists
-            parsed_file = parsed_pdf_path / f"{arxiv_id}.json"
-            if parsed_file.exists():
-                # Load existing PDF paper
-                pdf_paper = ArxivPdfPaper.from_json(parsed_file)
-                # Merge with original metadata from scanning if needed
-                if not pdf_paper.metadata.get('title') and paper_metadata.get('title'):
-                    pdf_paper.metadata['title'] = paper_metadata['title']
-                pdf_papers.append(pdf_paper)
-                continue
-            
-            # If not, download and create new PDF paper
-            try:
-                pdf_paper = fetch_paper_from_arxiv(arxiv_id, paper_metadata, source_pdf_path, keep_pdf=keep_pdf)
+    # Downloads are network-bound and rate limited, text extraction is CPU-bound:
+    # extract in background processes while the next PDF downloads.
+    pending_extractions = []
+    with ProcessPoolExecutor(max_workers=n_extract_workers) as extractor:
+        for paper_metadata in tqdm(papers_to_process, desc="Downloading PDFs", unit="papers"):
+            arxiv_id = paper_metadata.get('id')
+            if arxiv_id:
+                # Skip if previously failed
+                if arxiv_id in failed_downloads:
+                    tqdm.write(f"Skipping {arxiv_id} (previously failed)")
+                    continue
                 
-                if pdf_paper:
-                    # Save parsed PDF paper to JSON
-                    if save_parsed:
-                        pdf_paper.save_to_json(parsed_file)
-                    
+                # Check if parsed PDF paper already exists
+                parsed_file = parsed_pdf_path / f"{arxiv_id}.json"
+                if parsed_file.exists():
+                    # Load existing PDF paper
+                    pdf_paper = ArxivPdfPaper.from_json(parsed_file)
+                    # Merge with original metadata from scanning if needed
+                    if not pdf_paper.metadata.get('title') and paper_metadata.get('title'):
+                        pdf_paper.metadata['title'] = paper_metadata['title']
                     pdf_papers.append(pdf_paper)
-                else:
-                    # Mark as failed if download failed
-                    tqdm.write(f"Failed to download PDF {arxiv_id}")
-                    failed_downloads.add(arxiv_id)
+                    continue
+                
+                # If not, download and create new PDF paper
+                try:
+                    pdf_paper = fetch_paper_from_arxiv(
+                        arxiv_id, paper_metadata, source_pdf_path, keep_pdf=keep_pdf, extract_text=False
+                    )
                     
-            except Exception as e:
-                tqdm.write(f"Failed to process PDF {arxiv_id}: {e}")
-                failed_downloads.add(arxiv_id)
+                    if pdf_paper:
+                        future = extractor.submit(extract_text_from_pdf, pdf_paper.get_pdf_path_for_upload(), 10)
+                        pending_extractions.append((arxiv_id, pdf_paper, parsed_file, future))
+                        pdf_papers.append(pdf_paper)
+                    else:
+                        # Mark as failed if download failed
+                        tqdm.write(f"Failed to download PDF {arxiv_id}")
+                        failed_downloads.add(arxiv_id)
+                        
+                except Exception as e:
+                    tqdm.write(f"Failed to process PDF {arxiv_id}: {e}")
+                    failed_downloads.add(arxiv_id)
+                
+                # Save finished papers now so an interrupted run can resume; at most one
+                # extraction per worker stays outstanding while the next PDF downloads
+                pending_extractions = _save_extracted(pending_extractions, save_parsed, max_pending=n_extract_workers)
 
-            time.sleep(3)  # Rate limit for new downloads
+                time.sleep(3)  # Rate limit for new downloads
+        
+        # Collect the remaining extracted text
+        _save_extracted(pending_extractions, save_parsed)
     
     # Save updated failed downloads list
     with open(failed_downloads_file, 'w', encoding='utf-8') as f:
@@ -91,4 +106,34 @@ def download_arxiv_papers(config: Dict[str, Any], candidates: List[Dict[str, Any
     if save_parsed:
         print(f"Parsed PDF papers saved to {parsed_pdf_path}")
     
-    return pdf_papers
\ No newline at end of file
+    return pdf_papers
+
+
+def _save_extracted(pending_extractions: list, save_parsed: bool, max_pending: int = 0) -> list:
+    """
+    Set the text of papers whose background extraction has finished and save them, waiting
+    on the oldest extractions until at most max_pending are still running.
+    Params:
+        pending_extractions: (arxiv_id, pdf_paper, parsed_file, future) tuples, oldest first
+        save_parsed: Whether to save parsed papers to JSON
+        max_pending: Number of unfinished extractions to leave running (0 = wait for all)
+    Returns:
+        The extractions still running, oldest first.
+    """
+    n_to_wait = len(pending_extractions) - max_pending
+    still_pending = []
+    for n, (arxiv_id, pdf_paper, parsed_file, future) in enumerate(pending_extractions):
+        if n >= n_to_wait and not future.done():
+            still_pending.append((arxiv_id, pdf_paper, parsed_file, future))
+            continue
+        try:
+            pdf_paper.raw_text = future.result()
+        except Exception as e:
+            # Worker pool failure, fall back to extracting in this process
+            tqdm.write(f"Background text extraction failed for {arxiv_id}: {e}")
+            pdf_paper.raw_text = extract_text_from_pdf(pdf_paper.get_pdf_path_for_upload(), max_pages=10)
+        
+        # Save parsed PDF paper to JSON
+        if save_parsed:
+            pdf_paper.save_to_json(parsed_file)
+    return still_pending
@@ -1,28 +1,127 @@
 import os
+import re
 import json
+import asyncio
+import hashlib
 import logging
+import sqlite3
+import functools
 from google import genai
 from google.genai import types
-from typing import Optional, Dict, Any
+from google.genai import errors as genai_errors
+from pydantic import ValidationError
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential, before_sleep_log
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable, Tuple
 
 # Import the schema to generate the JSON constraint
 from sota_agent.model.schema import SOTAEntry
 from sota_agent.model.pdf_paper import ArxivPdfPaper
+from sota_agent.utils import json_backend
+from sota_agent.utils.cache import DiskCache, default_cache_dir
 
 
 # Setup Logger
 logger = logging.getLogger(__name__)
 
+
+def _slim_schema(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Compacts a Pydantic JSON schema for use as a response constraint: drops the
+    "title" annotations and inlines "$defs" references. Field descriptions are kept,
+    since they carry extraction instructions for the model.
+    """
+    if defs is None:
+        defs = schema.get('$defs', {})
+    if '$ref' in schema:
+        return _slim_schema(defs[schema['$ref'].rsplit('/', 1)[-1]], defs)
+    
+    slim = {}
+    for key, value in schema.items():
+        if key in ('title', '$defs'):
+            continue
+        if key == 'properties':
+            slim[key] = {name: _slim_schema(prop, defs) for name, prop in value.items()}
+        elif isinstance(value, dict):
+            slim[key] = _slim_schema(value, defs)
+        elif isinstance(value, list):
+            slim[key] = [_slim_schema(item, defs) if isinstance(item, dict) else item for item in value]
+        else:
+            slim[key] = value
+    return slim
+
+
+# JSON constraint for the LLM output, built once
+_SOTA_SCHEMA = _slim_schema(SOTAEntry.model_json_schema())
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug(
+        "SOTAEntry response schema: %d -> %d chars",
+        len(json.dumps(SOTAEntry.model_json_schema())), len(json.dumps(_SOTA_SCHEMA))
+    )
+
+# Persistent cache of extracted entries, keyed by a hash of model, prompt and PDF content.
+# Generation runs at temperature 0, so re-running the pipeline on unchanged inputs can reuse them.
+_RESPONSE_CACHE = DiskCache(default_cache_dir() / 'llm_responses.sqlite')
+
+# Paper metadata header of the single-paper prompt
+_TITLE_HEADER = "--- PAPER METADATA ---\n            TITLE: "
+
+
+# HTTP status codes worth retrying: rate limit, server error, unavailable, deadline exceeded
+_RETRYABLE_STATUS_CODES = frozenset({429, 500, 503, 504})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    return isinstance(exc, genai_errors.APIError) and exc.code in _RETRYABLE_STATUS_CODES
+
+
+# Retry transient API errors with jittered exponential backoff; anything else fails immediately
+_llm_retry = retry(
+    retry=retry_if_exception(_is_retryable),
+    stop=stop_after_attempt(5),
+    wait=wait_random_exponential(multiplier=1, max=30),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _dataset_pattern(dataset_names: Tuple[str, ...]) -> re.Pattern:
+    """
+    Case-insensitive pattern matching any of the dataset names, compiled once per name set.
+    """
+    return re.compile("|".join(re.escape(name) for name in dataset_names), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_genai_client(google_api_key: str) -> genai.Client:
+    """
+    One genai client per API key for the whole process, so credentials and
+    HTTP connections are set up once and reused by every GeminiAgentClient.
+    """
+    return genai.Client(api_key=google_api_key)
+
+
 class GeminiAgentClient:
+    # setup output content structure using Pydantic Model
+    _generation_config = types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=_SOTA_SCHEMA,
+        temperature=0.0,
+    )
+    _batch_generation_config = types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema={"type": "array", "items": _SOTA_SCHEMA},
+        temperature=0.0,
+    )
+    
     def __init__(self, google_api_key: str, location: str = "us-central1", model_name: str ="gemini-2.5-flash"):
         self.google_api_key = google_api_key
         self.location = location
         self.model_name = model_name
         
         # get GOOGLE_API_KEY from google_keys
-        self.client = genai.Client(
-            api_key=self.google_api_key
-        )
+        self.client = _get_genai_client(self.google_api_key)
     
     def analyze_paper_from_pdf(self, pdf_paper: ArxivPdfPaper, config: Dict[str, Any]) -> Optional[SOTAEntry]:
         """
@@ -34,7 +133,302 @@ class GeminiAgentClient:
         Returns:
             SOTAEntry object with extracted metrics, or None if extraction failed
         """
+        if not self._mentions_selected_dataset(pdf_paper, config):
+            logger.info("Skipping PDF without selected datasets: %s", pdf_paper.arxiv_id)
+            return None
+        
+        cache_key = self._response_cache_key(pdf_paper, config)
+        cached_entry = self._get_cached_entry(cache_key)
+        if cached_entry is not None:
+            return cached_entry
+        
+        system_prompt = self._build_system_prompt(pdf_paper, config)
+        
+        # Log prompt info
+        logger.info("Analyzing PDF: %s", pdf_paper.arxiv_id)
+        
+        try:
+            # Upload PDF to Gemini and get file object
+            uploaded_file = pdf_paper.upload_to_gemini(self.client, self._max_pdf_pages(config))
+            logger.info("PDF uploaded: %s", uploaded_file)
+
+            # Call LLM with PDF file + prompt (using Google AI SDK)
+            # Pass uploaded file object directly
+            response = self._generate_content([system_prompt, uploaded_file], self._generation_config)
+            
+            entry = self._parse_response(response)
+            self._cache_entry(cache_key, entry)
+            return entry
+            
+        except Exception as e:
+            logger.exception("PDF LLM Extraction Failed: %s", e)
+            logger.error("Paper ID: %s, Title: %.50s", pdf_paper.arxiv_id, pdf_paper.metadata.get('title', 'Unknown'))
+            return None
+    
+    async def analyze_paper_from_pdf_async(self, pdf_paper: ArxivPdfPaper, config: Dict[str, Any]) -> Optional[SOTAEntry]:
+        """
+        Async version of analyze_paper_from_pdf, so many papers can be in flight at once.
+        Params:
+            pdf_paper: ArxivPdfPaper object with PDF path
+            config: LLM extraction parameters from YAML config
+        Returns:
+            SOTAEntry object with extracted metrics, or None if extraction failed
+        """
+        system_prompt = self._build_system_prompt(pdf_paper, config)
+        
+        logger.info("Analyzing PDF: %s", pdf_paper.arxiv_id)
+        
+        try:
+            # Upload in a worker thread so other requests keep progressing
+            uploaded_file = await asyncio.to_thread(pdf_paper.upload_to_gemini, self.client, self._max_pdf_pages(config))
+            logger.info("PDF uploaded: %s", uploaded_file)
+
+            response = await self._generate_content_async([system_prompt, uploaded_file], self._generation_config)
+            
+            return self._parse_response(response)
+            
+        except Exception as e:
+            logger.exception("PDF LLM Extraction Failed: %s", e)
+            logger.error("Paper ID: %s, Title: %.50s", pdf_paper.arxiv_id, pdf_paper.metadata.get('title', 'Unknown'))
+            return None
+    
+    async def analyze_batch_from_pdf_async(self, pdf_papers: List[ArxivPdfPaper], config: Dict[str, Any]) -> List[Optional[SOTAEntry]]:
+        """
+        Analyzes several PDF papers in a single request that returns a JSON array of SOTAEntry,
+        so the instruction prompt is sent once per batch instead of once per paper.
+        Papers the batched response does not cover are retried with single-paper requests.
+        Params:
+            pdf_papers: ArxivPdfPaper objects to analyze together
+            config: LLM extraction parameters from YAML config
+        Returns:
+            List of SOTAEntry (or None on failure), aligned with pdf_papers
+        """
+        batch_prompt = self._build_batch_prompt(len(pdf_papers), config)
+        
+        logger.info("Analyzing PDF batch: %s", [pdf_paper.arxiv_id for pdf_paper in pdf_papers])
+        
+        try:
+            max_pages = self._max_pdf_pages(config)
+            uploaded_files = await asyncio.gather(
+                *(asyncio.to_thread(pdf_paper.upload_to_gemini, self.client, max_pages) for pdf_paper in pdf_papers)
+            )
+            
+            contents = [batch_prompt]
+            for i, (pdf_paper, uploaded_file) in enumerate(zip(pdf_papers, uploaded_files)):
+                contents += [f"[{i}] TITLE: {pdf_paper.metadata.get('title', 'N/A')}", uploaded_file]
+            
+            response = await self._generate_content_async(contents, self._batch_generation_config)
+            
+            entries = self._parse_batch_response(response, len(pdf_papers))
+            
+        except Exception as e:
+            logger.exception("Batched PDF LLM Extraction Failed: %s", e)
+            entries = [None] * len(pdf_papers)
+        
+        # Fall back to single-paper requests for anything the batch did not return
+        for i, entry in enumerate(entries):
+            if entry is None:
+                entries[i] = await self.analyze_paper_from_pdf_async(pdf_papers[i], config)
+        
+        return entries
+    
+    @_llm_retry
+    def _generate_content(self, contents: List[Any], generation_config: types.GenerateContentConfig):
+        """
+        Calls the model, retrying rate limits and transient server errors.
+        Response parsing stays outside so schema errors are not retried.
+        """
+        return self.client.models.generate_content(
+            model=self.model_name,
+            contents=contents,
+            config=generation_config
+        )
+    
+    @_llm_retry
+    async def _generate_content_async(self, contents: List[Any], generation_config: types.GenerateContentConfig):
+        """
+        Async version of _generate_content.
+        """
+        return await self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=contents,
+            config=generation_config
+        )
+    
+    async def analyze_papers_from_pdf(
+        self,
+        pdf_papers: List[ArxivPdfPaper],
+        config: Dict[str, Any],
+        max_concurrency: int = 16,
+        batch_size: int = 1,
+        on_complete: Optional[Callable[[ArxivPdfPaper, Optional[SOTAEntry]], None]] = None
+    ) -> List[Optional[SOTAEntry]]:
+        """
+        Analyzes many PDF papers concurrently, with at most max_concurrency requests in flight.
+        Params:
+            pdf_papers: ArxivPdfPaper objects to analyze
+            config: LLM extraction parameters from YAML config
+            max_concurrency: Maximum number of requests in flight at the same time
+            batch_size: Number of papers sent per request (1 = one request per paper)
+            on_complete: Optional callback invoked with (pdf_paper, entry) as each paper finishes
+        Returns:
+            List of SOTAEntry (or None on failure), aligned with pdf_papers
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        entries: List[Optional[SOTAEntry]] = [None] * len(pdf_papers)
+        
+        # Papers whose text never mentions a selected dataset, or that were already
+        # extracted by an earlier run, are resolved without an LLM call
+        candidates = []
+        for i, pdf_paper in enumerate(pdf_papers):
+            if self._mentions_selected_dataset(pdf_paper, config):
+                candidates.append(i)
+            else:
+                logger.info("Skipping PDF without selected datasets: %s", pdf_paper.arxiv_id)
+                if on_complete is not None:
+                    on_complete(pdf_paper, None)
+        
+        # Only PDFs that may be sent to the LLM are hashed for the response cache
+        cache_keys: List[Optional[str]] = [None] * len(pdf_papers)
+        candidate_keys = await asyncio.gather(
+            *(asyncio.to_thread(self._response_cache_key, pdf_papers[i], config) for i in candidates)
+        )
+        to_analyze = []
+        for i, cache_key in zip(candidates, candidate_keys):
+            cache_keys[i] = cache_key
+            entries[i] = self._get_cached_entry(cache_key)
+            if entries[i] is None:
+                to_analyze.append(i)
+            elif on_complete is not None:
+                on_complete(pdf_papers[i], entries[i])
+        
+        async def analyze(batch: List[ArxivPdfPaper]) -> List[Optional[SOTAEntry]]:
+            async with semaphore:
+                if len(batch) == 1:
+                    entries = [await self.analyze_paper_from_pdf_async(batch[0], config)]
+                else:
+                    entries = await self.analyze_batch_from_pdf_async(batch, config)
+            if on_complete is not None:
+                for pdf_paper, entry in zip(batch, entries):
+                    on_complete(pdf_paper, entry)
+            return entries
+        
+        index_batches = [to_analyze[i:i + batch_size] for i in range(0, len(to_analyze), batch_size)]
+        batch_entries = await asyncio.gather(
+            *(analyze([pdf_papers[i] for i in index_batch]) for index_batch in index_batches)
+        )
+        for index_batch, batch_entry in zip(index_batches, batch_entries):
+            for i, entry in zip(index_batch, batch_entry):
+                entries[i] = entry
+                # Cache keys hash the single-paper prompt; answers to a batched prompt are not cached
+                if len(index_batch) == 1:
+                    self._cache_entry(cache_keys[i], entry)
+        return entries
+    
+    def _build_system_prompt(self, pdf_paper: ArxivPdfPaper, config: Dict[str, Any]) -> str:
+        """
+        Builds the extraction prompt for one paper from the LLM config.
+        """
+        instructions, suffix = self._build_prompt_template(*self._prompt_key(config))
+        # Only the title varies per paper; join it into the cached template in a single allocation
+        system_prompt = "".join((instructions, _TITLE_HEADER, str(pdf_paper.metadata.get('title', 'N/A')), suffix))
+
+        # # Save final prompt to a text file for debugging
+        # os.makedirs("data/debug_prompts", exist_ok=True)
+        # debug_prompt_path = f"data/debug_prompts/{pdf_paper.arxiv_id}_prompt.txt"
+        # with open(debug_prompt_path, "w", encoding="utf-8") as f:
+        #     f.write(system_prompt)
         
+        return system_prompt
+    
+    def _build_batch_prompt(self, n_papers: int, config: Dict[str, Any]) -> str:
+        """
+        Builds the extraction prompt for a batch of papers sent in one request.
+        Each PDF is preceded in the request by an "[index] TITLE: ..." part.
+        """
+        instructions, suffix = self._build_prompt_template(*self._prompt_key(config))
+        papers_block = f"""--- PAPERS ---
+            You are given {n_papers} papers. Each paper's PDF follows its "[index] TITLE: ..." line.
+            Apply the instructions above to each paper independently and return a JSON array with exactly {n_papers} objects, one per paper, in index order.
+"""
+        return "".join((instructions, papers_block, suffix))
+    
+    @staticmethod
+    def _mentions_selected_dataset(pdf_paper: ArxivPdfPaper, config: Dict[str, Any]) -> bool:
+        """
+        Cheap check on the already extracted text before spending an LLM call.
+        Papers without extracted text are always sent, as is everything when prefilter_dataset is off.
+        Optional dataset_aliases (dataset name -> list of aliases) also count as mentions.
+        """
+        if not config.get('prefilter_dataset', True):
+            return True
+        text = pdf_paper.get_raw_text()
+        if not text:
+            return True
+        dataset_names = tuple(config['selected_dataset_names']) + tuple(
+            alias for aliases in config.get('dataset_aliases', {}).values() for alias in aliases
+        )
+        return _dataset_pattern(dataset_names).search(text) is not None
+    
+    def _response_cache_key(self, pdf_paper: ArxivPdfPaper, config: Dict[str, Any]) -> Optional[str]:
+        """
+        Content hash identifying one extraction: model, prompt, page cap and PDF bytes.
+        Returns None when caching is disabled (cache_responses: false), there is no PDF on disk,
+        or the PDF cannot be read; the paper is then analyzed without the cache.
+        """
+        if not config.get('cache_responses', True):
+            return None
+        try:
+            pdf_path = pdf_paper.get_pdf_path_for_upload()
+            if not pdf_path or not Path(pdf_path).exists():
+                return None
+            
+            digest = hashlib.blake2b(digest_size=16)
+            for part in (self.model_name, self._build_system_prompt(pdf_paper, config), str(self._max_pdf_pages(config))):
+                digest.update(part.encode('utf-8'))
+                digest.update(b'\0')
+            with open(pdf_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except OSError as e:
+            logger.warning("Response cache key for %s could not be computed: %s", pdf_paper.arxiv_id, e)
+            return None
+    
+    @staticmethod
+    def _get_cached_entry(cache_key: Optional[str]) -> Optional[SOTAEntry]:
+        if cache_key is None:
+            return None
+        try:
+            data = _RESPONSE_CACHE.get(cache_key)
+            return SOTAEntry.model_validate(data) if data is not None else None
+        except (sqlite3.Error, OSError, ValidationError) as e:
+            logger.warning("Response cache lookup failed: %s", e)
+            return None
+    
+    @staticmethod
+    def _cache_entry(cache_key: Optional[str], entry: Optional[SOTAEntry]):
+        # Failed extractions are not cached, so they are retried on the next run
+        if cache_key is not None and entry is not None:
+            try:
+                _RESPONSE_CACHE.set(cache_key, entry.model_dump(mode='json'))
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Response cache write failed: %s", e)
+    
+    @staticmethod
+    def _max_pdf_pages(config: Dict[str, Any]) -> Optional[int]:
+        """
+        Page cap for uploaded PDFs; bounds the input tokens (and cost) of very long papers.
+        -1 (or any value below 1) means no limit.
+        """
+        max_pdf_pages = config.get('max_pdf_pages', -1)
+        return None if max_pdf_pages < 1 else max_pdf_pages
+    
+    @staticmethod
+    def _prompt_key(config: Dict[str, Any]) -> Tuple[str, str, str, str]:
+        """
+        Extracts the config values the prompt depends on, as a hashable cache key.
+        """
         # Extract dataset names
         dataset_name = ", ".join(config['selected_dataset_names'])
         
@@ -46,8 +440,17 @@ class GeminiAgentClient:
         taxonomy_hierarchy = config.get('taxonomy_hierarchy', {})
         taxonomy_str = json.dumps(taxonomy_hierarchy, indent=2)
         
-        # Construct the System Prompt for PDF analysis
-        system_prompt = f"""
+        return dataset_name, metric_name, metric_desc, taxonomy_str
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _build_prompt_template(dataset_name: str, metric_name: str, metric_desc: str, taxonomy_str: str) -> Tuple[str, str]:
+        """
+        Builds the static parts of the prompt: the instructions before the paper metadata and the closing note.
+        Cached, since they only depend on the LLM config.
+        """
+        # Construct the System Prompt for PDF analysis, split around the paper metadata
+        instructions = f"""
             You are an automated Data Extraction Agent analyzing a research paper PDF to extract State-of-the-Art (SOTA) leaderboard data.
 
             --- TARGETS ---
@@ -102,49 +505,46 @@ class GeminiAgentClient:
 
             7. **dataset_mentioned**: Specific check if {dataset_name} is explicitly tested or mentioned.
 
-            --- PAPER METADATA ---
-            TITLE: {pdf_paper.metadata.get('title', 'N/A')}
+            """
+        suffix = """
     
             IMPORTANT: You have access to the full PDF document. Do not truncate your analysis - examine all main pages, especially later sections containing results and experiments. You can ignore references and appendices.
         """ 
         
-        # # Save final prompt to a text file for debugging
-        # os.makedirs("data/debug_prompts", exist_ok=True)
-        # debug_prompt_path = f"data/debug_prompts/{pdf_paper.arxiv_id}_prompt.txt"
-        # with open(debug_prompt_path, "w", encoding="utf-8") as f:
-        #     f.write(system_prompt)
+        return instructions, suffix
+    
+    @staticmethod
+    def _parse_response(response) -> Optional[SOTAEntry]:
+        """
+        Parse and validate the LLM response.
+        """
+        if response.text is None:
+            logger.error("LLM returned no text content")
+            return None
         
-        # Log prompt info
-        logger.info(f"Analyzing PDF: {pdf_paper.arxiv_id}")
+        # orjson + model_validate is faster than Pydantic's own JSON parser; validation
+        # still runs because the field validators normalize the LLM output
+        return SOTAEntry.model_validate(json_backend.loads(response.text))
+    
+    @staticmethod
+    def _parse_batch_response(response, n_papers: int) -> List[Optional[SOTAEntry]]:
+        """
+        Parse a batched response into entries aligned with the batch; unusable items become None.
+        """
+        if response.text is None:
+            logger.error("LLM returned no text content")
+            return [None] * n_papers
         
-        try:
-            # Upload PDF to Gemini and get file object
-            uploaded_file = pdf_paper.upload_to_gemini(self.client)
-            logger.info(f"PDF uploaded: {uploaded_file}")
-            
-            # setup output content structure using Pydantic Model
-            generator_config = types.GenerateContentConfig(
-                                    response_mime_type="application/json",
-                                    response_schema=SOTAEntry.model_json_schema(),
-                                    temperature=0.0,
-                                )
-
-            # Call LLM with PDF file + prompt (using Google AI SDK)
-            # Pass uploaded file object directly
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=[system_prompt, uploaded_file],
-                config=generator_config
-            )
-            
-            # Parse and validate response
-            if response.text is None:
-                logger.error("LLM returned no text content")
-                return None
-            
-            return SOTAEntry.model_validate_json(response.text)
-            
-        except Exception as e:
-            logger.error(f"PDF LLM Extraction Failed: {e}")
-            logger.error(f"Paper ID: {pdf_paper.arxiv_id}, Title: {pdf_paper.metadata.get('title', 'Unknown')[:50]}")
-            return None
\ No newline at end of file
+        items = json_backend.loads(response.text)
+        if not isinstance(items, list) or len(items) != n_papers:
+            logger.error("Batched response does not match the batch of %d papers", n_papers)
+            return [None] * n_papers
+        
+        entries = []
+        for item in items:
+            try:
+                entries.append(SOTAEntry.model_validate(item))
+            except ValidationError as e:
+                logger.error("Invalid entry in batched response: %s", e)
+                entries.append(None)
+        return entries
@@ -1,10 +1,19 @@
+import os
 import sys
 import json
+import functools
+import numpy as np
 from tqdm import tqdm
-from typing import List
+from typing import Callable, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
 from sota_agent.model.pdf_paper import ArxivPdfPaper
 
+try:
+    import ahocorasick  # matches all keywords in a single pass over the text
+except ImportError:
+    ahocorasick = None
+
 
 def filter_papers(config: dict, parsed_papers: List[ArxivPdfPaper], paths: dict) -> List[ArxivPdfPaper]:
     """
@@ -24,13 +33,8 @@ def filter_papers(config: dict, parsed_papers: List[ArxivPdfPaper], paths: dict)
         filtered_papers = parsed_papers
     else:
         print(f"\nFiltering PDFs by keywords: {content_keywords}")
-        filtered_papers = []
-        for pdf_paper in tqdm(parsed_papers, desc="Scanning PDF content", unit="papers"):
-            # Search in extracted text
-            pdf_text = pdf_paper.get_raw_text().lower()
-            
-            if any(kw.lower() in pdf_text for kw in content_keywords):
-                filtered_papers.append(pdf_paper)
+        mask = filter_papers_mask(config, parsed_papers)
+        filtered_papers = [pdf_paper for pdf_paper, is_match in zip(parsed_papers, mask) if is_match]
         
         print(f"PDFs after content filtering: {len(filtered_papers)} / {len(parsed_papers)}")
     
@@ -45,7 +49,70 @@ def filter_papers(config: dict, parsed_papers: List[ArxivPdfPaper], paths: dict)
         preview_output_path = paths['OUTPUT'] / "filtered_papers_preview.json"
         paths['OUTPUT'].mkdir(parents=True, exist_ok=True)
         with open(preview_output_path, 'w', encoding='utf-8') as f:
-            json.dump([paper.to_dict() for paper in filtered_papers[:n]], f, indent=4, ensure_ascii=False)
+            json.dump([paper.to_dict(include_text=True) for paper in filtered_papers[:n]], f, indent=4, ensure_ascii=False)
         print(f"Filtered paper preview saved to {preview_output_path}")
 
-    return filtered_papers
\ No newline at end of file
+    return filtered_papers
+
+
+def filter_papers_mask(config: dict, parsed_papers: List[ArxivPdfPaper]) -> np.ndarray:
+    """
+    Match downloaded PDF papers against content keywords without building a filtered list.
+    Params:
+        config: PARSED_PAPER_SCANNING_PARAMETERS from YAML config.
+        parsed_papers: List of downloaded ArxivPdfPaper objects from step 2.
+    Returns:
+        Boolean array aligned with parsed_papers; True where the paper matches
+        (all True when no content keywords are configured).
+    """
+    content_keywords = config.get('content_keywords', [])
+    if not content_keywords:
+        return np.ones(len(parsed_papers), dtype=bool)
+    
+    matches_keywords = _build_keyword_matcher(content_keywords)
+    
+    def matches_content(pdf_paper: ArxivPdfPaper) -> bool:
+        # Search in extracted text
+        return matches_keywords(pdf_paper.get_raw_text().lower())
+    
+    filter_workers = config.get('filter_workers', 1)
+    n_workers = (os.cpu_count() or 1) if filter_workers == -1 else filter_workers
+    # Threads overlap reading the extracted text files from disk; a pool isn't worth it for a handful of papers
+    if n_workers > 1 and len(parsed_papers) >= 4:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            matched = tqdm(executor.map(matches_content, parsed_papers), total=len(parsed_papers),
+                           desc="Scanning PDF content", unit="papers")
+            return np.fromiter(matched, dtype=bool, count=len(parsed_papers))
+    matched = (matches_content(pdf_paper)
+               for pdf_paper in tqdm(parsed_papers, desc="Scanning PDF content", unit="papers"))
+    return np.fromiter(matched, dtype=bool, count=len(parsed_papers))
+
+
+def _build_keyword_matcher(keywords: List[str]) -> Callable[[str], bool]:
+    """
+    Build a function that tells whether lowercased text contains any of the keywords.
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, so the text is
+    scanned once regardless of the number of keywords.
+    """
+    # Lowercase keywords once here rather than once per paper
+    kws_lower = tuple(kw.lower() for kw in keywords)
+    # An empty keyword matches every text, but add_word ignores it and iterating an empty automaton raises
+    if ahocorasick is None or '' in kws_lower:
+        return lambda text: any(kw in text for kw in kws_lower)
+    
+    # Sorted and deduplicated so the same keyword set in any order reuses one automaton
+    automaton = _keyword_automaton(tuple(sorted(set(kws_lower))))
+    return lambda text: next(automaton.iter(text), None) is not None
+
+
+@functools.lru_cache(maxsize=16)
+def _keyword_automaton(kws_lower: Tuple[str, ...]) -> 'ahocorasick.Automaton':
+    """
+    Compile an Aho-Corasick automaton for the lowercased keywords, once per keyword set.
+    The automaton is read-only after make_automaton(), so it can be shared between threads.
+    """
+    automaton = ahocorasick.Automaton()
+    for kw in kws_lower:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
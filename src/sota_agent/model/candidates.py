@@ -0,0 +1,146 @@
+import numpy as np
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
+
+
+# Metadata fields kept for each candidate paper
+CANDIDATE_FIELDS = ('id', 'title', 'authors', 'abstract', 'categories', 'update_date', 'doi')
+
+# Placeholder for a field absent from the source record, so rows can leave it out
+_MISSING = object()
+
+
+@dataclass(eq=False)
+class ArxivCandidates(Sequence):
+    """
+    Columnar (structure-of-arrays) container for candidate paper metadata from the metadata scan.
+    Avoids one dict per paper; rows are materialized as metadata dicts on access, so it can be
+    used wherever a list of metadata dicts was expected. Fields absent from a source record are
+    absent from its row, and update_date comes back exactly as it appeared in the record.
+    """
+    ids: np.ndarray
+    titles: List[Optional[str]]
+    authors: List[Optional[str]]
+    abstracts: List[Optional[str]]
+    categories: List[Optional[str]]
+    update_dates: np.ndarray
+    dois: List[Optional[str]]
+    # Original update_date values that update_dates does not reproduce (missing, null,
+    # unparseable or not in YYYY-MM-DD form), keyed by row index
+    update_date_overrides: Dict[int, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'ArxivCandidates':
+        """
+        Build candidates from an iterable of metadata dicts.
+        """
+        builder = ArxivCandidatesBuilder()
+        builder.extend(records)
+        return builder.build()
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """
+        Materialize candidate i as a metadata dict.
+        """
+        if i < 0:
+            i += len(self)
+        if i in self.update_date_overrides:
+            update_date = self.update_date_overrides[i]
+        else:
+            update_date = str(self.update_dates[i])
+        row = {
+            'id': str(self.ids[i]) or _MISSING,
+            'title': self.titles[i],
+            'authors': self.authors[i],
+            'abstract': self.abstracts[i],
+            'categories': self.categories[i],
+            'update_date': update_date,
+            'doi': self.dois[i],
+        }
+        return {key: value for key, value in row.items() if value is not _MISSING}
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], 'ArxivCandidates']:
+        if isinstance(index, slice):
+            positions = range(len(self))[index]
+            return ArxivCandidates(
+                ids=self.ids[index],
+                titles=self.titles[index],
+                authors=self.authors[index],
+                abstracts=self.abstracts[index],
+                categories=self.categories[index],
+                update_dates=self.update_dates[index],
+                dois=self.dois[index],
+                update_date_overrides={
+                    j: self.update_date_overrides[i] for j, i in enumerate(positions) if i in self.update_date_overrides
+                },
+            )
+        return self.row(index)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __repr__(self) -> str:
+        return f"ArxivCandidates(n={len(self)})"
+
+
+class ArxivCandidatesBuilder:
+    """
+    Accumulates candidate metadata column by column, then freezes it into ArxivCandidates.
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, list] = {name: [] for name in CANDIDATE_FIELDS}
+
+    def append(self, record: Dict[str, Any]):
+        """
+        Add one metadata dict, keeping only CANDIDATE_FIELDS.
+        """
+        for name, column in self._columns.items():
+            column.append(record.get(name, _MISSING))
+
+    def extend(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self._columns['id'])
+
+    def build(self) -> ArxivCandidates:
+        columns = self._columns
+        dates = columns['update_date']
+        update_dates = _to_day_array([d if isinstance(d, str) else None for d in dates])
+        return ArxivCandidates(
+            ids=np.array(['' if i is None or i is _MISSING else i for i in columns['id']], dtype=str),
+            titles=columns['title'],
+            authors=columns['authors'],
+            abstracts=columns['abstract'],
+            categories=columns['categories'],
+            update_dates=update_dates,
+            dois=columns['doi'],
+            update_date_overrides={
+                i: date for i, (date, day) in enumerate(zip(dates, np.datetime_as_string(update_dates)))
+                if date != day
+            },
+        )
+
+
+def _to_day_array(dates: List[Optional[str]]) -> np.ndarray:
+    """
+    Convert date strings to a datetime64[D] array; missing or malformed dates become NaT.
+    """
+    try:
+        return np.array([d or 'NaT' for d in dates], dtype='datetime64[D]')
+    except ValueError:
+        return np.array([_to_day(d) for d in dates], dtype='datetime64[D]')
+
+
+def _to_day(date: Optional[str]) -> np.datetime64:
+    try:
+        return np.datetime64(date[:10], 'D')
+    except (TypeError, ValueError):
+        return np.datetime64('NaT', 'D')
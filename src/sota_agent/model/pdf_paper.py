@@ -1,13 +1,21 @@
-import json
+import PyPDF2
+import tempfile
 from pathlib import Path
 from typing import Optional, Dict
 
+from sota_agent.utils import json_backend
+
 
 class ArxivPdfPaper:
     """
     Class for an ArXiv paper processed via PDF (no section parsing).
     Used as alternative to LaTeX-based ArxivPaper when full document analysis is needed.
     """
+    # Thousands of these are kept in memory between pipeline steps; slots drop the per-instance dict
+    __slots__ = (
+        'arxiv_id', 'pdf_path', 'metadata', '_raw_text', '_raw_text_path',
+        'gemini_file_uri', 'downloaded_date', '_temp_pdf_path',
+    )
     
     def __init__(self, arxiv_id: str, pdf_path: Optional[Path] = None, metadata: Optional[Dict] = None):
         """
@@ -21,11 +29,25 @@ class ArxivPdfPaper:
         self.arxiv_id = arxiv_id
         self.pdf_path = Path(pdf_path) if pdf_path else None
         self.metadata = metadata or {}
-        self.raw_text: Optional[str] = None  # Extracted text for filtering (first 10 pages)
+        self._raw_text: Optional[str] = None  # Extracted text for filtering (first 10 pages)
+        self._raw_text_path: Optional[Path] = None  # Sibling .txt file holding raw_text, loaded on first access
         self.gemini_file_uri: Optional[str] = None  # Cached URI after upload to Gemini
         self.downloaded_date: Optional[str] = None
         self._temp_pdf_path: Optional[Path] = None  # Temporary path if not keeping PDF
     
+    @property
+    def raw_text(self) -> Optional[str]:
+        """
+        Extracted text, read from the sibling text file on first access when loaded from JSON.
+        """
+        if self._raw_text is None and self._raw_text_path is not None and self._raw_text_path.exists():
+            self._raw_text = self._raw_text_path.read_text(encoding='utf-8')
+        return self._raw_text
+    
+    @raw_text.setter
+    def raw_text(self, value: Optional[str]):
+        self._raw_text = value
+    
     def get_pdf_path_for_upload(self) -> Optional[Path]:
         """
         Get the PDF path to use for Gemini upload.
@@ -42,12 +64,13 @@ class ArxivPdfPaper:
         """
         return self.raw_text if self.raw_text else ""
     
-    def upload_to_gemini(self, client):
+    def upload_to_gemini(self, client, max_pages: Optional[int] = None):
         """
         Uploads PDF to Gemini File API and caches the file object.
         
         Args:
             client: Gemini client instance with file upload capability
+            max_pages: If set to a positive number, only the first max_pages pages are uploaded
             
         Returns:
             Uploaded file object for use in Gemini API calls
@@ -63,7 +86,12 @@ class ArxivPdfPaper:
             raise ValueError(f"PDF file not found for {self.arxiv_id}: {pdf_path}")
         
         # Upload to Gemini File API (Google AI SDK)
-        uploaded_file = client.files.upload(file=str(pdf_path))
+        truncated_path = _write_first_pages(pdf_path, max_pages) if max_pages is not None and max_pages > 0 else None
+        try:
+            uploaded_file = client.files.upload(file=str(truncated_path or pdf_path))
+        finally:
+            if truncated_path:
+                truncated_path.unlink(missing_ok=True)
         
         # Cache the URI for reference
         if hasattr(uploaded_file, 'uri'):
@@ -71,32 +99,44 @@ class ArxivPdfPaper:
         
         return uploaded_file
     
-    def to_dict(self) -> Dict:
+    def to_dict(self, include_text: bool = False) -> Dict:
         """
         Serialize paper to dictionary for JSON storage.
         
+        Args:
+            include_text: Embed raw_text in the dictionary instead of only referencing its text file
+        
         Returns:
             Dictionary representation
         """
-        return {
+        data = {
             "arxiv_id": self.arxiv_id,
             "pdf_path": str(self.pdf_path) if self.pdf_path else None,
             "metadata": self.metadata,
-            "raw_text": self.raw_text,
+            # Relative to the JSON file written by save_to_json, so the parsed papers directory can be moved
+            "raw_text_path": self._raw_text_path.name if self._raw_text_path else None,
             "gemini_file_uri": self.gemini_file_uri,
             "downloaded_date": self.downloaded_date
         }
+        if include_text:
+            data["raw_text"] = self.raw_text
+        return data
     
     def save_to_json(self, output_path: Path):
         """
-        Save PDF paper metadata to JSON file.
+        Save PDF paper metadata to JSON file. The extracted text is written to a
+        sibling .txt file so the JSON stays small and loads quickly.
         
         Args:
             output_path: Path to save JSON file
         """
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        if self.raw_text is not None:
+            text_path = output_path.with_suffix('.txt')
+            text_path.write_text(self.raw_text, encoding='utf-8')
+            self._raw_text_path = text_path
+        
+        output_path.write_bytes(json_backend.dumps(self.to_dict(), indent=True))
     
     @classmethod
     def from_json(cls, json_path: Path) -> 'ArxivPdfPaper':
@@ -109,14 +149,17 @@ class ArxivPdfPaper:
         Returns:
             ArxivPdfPaper instance
         """
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        json_path = Path(json_path)
+        data = json_backend.loads(json_path.read_bytes())
         
         paper = cls(
             arxiv_id=data['arxiv_id'],
             pdf_path=Path(data['pdf_path']) if data.get('pdf_path') else None,
             metadata=data.get('metadata', {})
         )
+        if data.get('raw_text_path'):
+            paper._raw_text_path = json_path.parent / data['raw_text_path']
+        # Older files embed the text directly
         paper.raw_text = data.get('raw_text')
         paper.gemini_file_uri = data.get('gemini_file_uri')
         paper.downloaded_date = data.get('downloaded_date')
@@ -125,3 +168,23 @@ class ArxivPdfPaper:
     
     def __repr__(self) -> str:
         return f"ArxivPdfPaper(id={self.arxiv_id}, pdf={'Yes' if self.pdf_path else 'No'})"
+
+
+def _write_first_pages(pdf_path: Path, max_pages: int) -> Optional[Path]:
+    """
+    Writes the first max_pages pages of a PDF to a temporary file.
+    
+    Returns:
+        Path to the temporary PDF, or None if the PDF is not longer than max_pages
+    """
+    reader = PyPDF2.PdfReader(str(pdf_path))
+    if len(reader.pages) <= max_pages:
+        return None
+    
+    writer = PyPDF2.PdfWriter()
+    for page in reader.pages[:max_pages]:
+        writer.add_page(page)
+    
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
+        writer.write(tmp_file)
+    return Path(tmp_file.name)
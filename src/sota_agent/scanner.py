@@ -1,39 +1,44 @@
+import os
+import re
 import sys
 import datetime
+import functools
+import itertools
+import pandas as pd
 from tqdm import tqdm
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
 
-from sota_agent.utils.data_ingester import stream_arxiv_data
+from sota_agent.model.candidates import ArxivCandidates, ArxivCandidatesBuilder, CANDIDATE_FIELDS
+from sota_agent.utils.data_ingester import stream_arxiv_data, split_line_aligned
 
+# Records parsed per pandas chunk in the vectorized scan
+_VECTORIZED_CHUNK_SIZE = 65536
 
-def scan_arxiv_metadata(config: Dict[str, Any], paths: Dict[str, Any]) -> list:
+
+def scan_arxiv_metadata(config: Dict[str, Any], paths: Dict[str, Any]) -> ArxivCandidates:
     """
     Scans the ArXiv dataset for papers matching the filtering criteria.
     Params:
         config: ARXIV_METADATA_SCANNING_PARAMETERS from YAML config.
         paths: Dictionary of predetermined file paths.
     Returns:
-        List of candidate paper metadata dicts.
+        Columnar ArxivCandidates; indexing or iterating yields candidate metadata dicts.
     """
     
-    candidates = []
-    scanned_count = 0
+    scan_workers = config.get('scan_workers', 1)
+    scan_limit = _scan_limit(config)
 
     print("\nScanning for papers... ", end="")
     try:
-        data_stream = stream_arxiv_data(paths['DATA'])
-        pbar = tqdm(data_stream, desc="Scanning", unit="papers")
-        for paper in pbar:
-            
-            if config["max_metadata_scan_limit"] != -1 and scanned_count >= config["max_metadata_scan_limit"]:
-                break
-                
-            if filter_arxiv_metadata(paper, config):
-                candidates.append(paper)
-                pbar.set_postfix({"Found": len(candidates)})
-            
-            scanned_count += 1
-            
+        if config.get('use_vectorized', False):
+            candidates = _scan_vectorized(config, paths['DATA'])
+        # A scan limit means "the first N records", which only a sequential scan can honour
+        elif scan_workers != 1 and scan_limit is None:
+            candidates = _scan_sharded(config, paths['DATA'], scan_workers)
+        else:
+            candidates = _scan_sequential(config, paths['DATA'])
     except FileNotFoundError:
         print(f"Error: Data file not found at {paths['DATA']}")
         sys.exit(1)
@@ -50,6 +55,143 @@ def scan_arxiv_metadata(config: Dict[str, Any], paths: Dict[str, Any]) -> list:
     return candidates
 
 
+def _scan_limit(config: Dict[str, Any]) -> Optional[int]:
+    """
+    Number of records to scan, or None for the whole dataset (-1, or any negative value).
+    """
+    scan_limit = config["max_metadata_scan_limit"]
+    return None if scan_limit < 0 else scan_limit
+
+
+def _scan_sequential(config: Dict[str, Any], data_path: Path) -> ArxivCandidates:
+    """
+    Scans the dataset in a single pass, stopping after max_metadata_scan_limit records.
+    """
+    builder = ArxivCandidatesBuilder()
+    scan_limit = _scan_limit(config)
+
+    data_stream = stream_arxiv_data(data_path, fields=CANDIDATE_FIELDS)
+    # islice stops pulling (and parsing) records as soon as the limit is reached
+    records = itertools.islice(data_stream, scan_limit) if scan_limit is not None else data_stream
+    try:
+        pbar = tqdm(records, desc="Scanning", unit="papers")
+        for paper in pbar:
+            if filter_arxiv_metadata(paper, config):
+                builder.append(paper)
+                pbar.set_postfix({"Found": len(builder)})
+    finally:
+        # Close the data file now rather than whenever the generator is garbage collected
+        if hasattr(data_stream, 'close'):
+            data_stream.close()
+
+    return builder.build()
+
+
+def _scan_sharded(config: Dict[str, Any], data_path: Path, scan_workers: int) -> ArxivCandidates:
+    """
+    Scans line-aligned byte ranges of the dataset in parallel worker processes.
+    """
+    n_workers = (os.cpu_count() or 1) if scan_workers == -1 else scan_workers
+    # A few shards per worker evens out ranges that are slower to filter
+    shards = split_line_aligned(data_path, n_workers * 4)
+
+    builder = ArxivCandidatesBuilder()
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [executor.submit(_scan_shard, data_path, start, end, config) for start, end in shards]
+        # Collect in shard order so candidates keep file order
+        pbar = tqdm(futures, desc="Scanning", unit="shards")
+        for future in pbar:
+            builder.extend(future.result())
+            pbar.set_postfix({"Found": len(builder)})
+
+    return builder.build()
+
+
+def _scan_vectorized(config: Dict[str, Any], data_path: Path) -> ArxivCandidates:
+    """
+    Scans the dataset in chunks of records, applying the filter_arxiv_metadata criteria as
+    pandas column operations instead of one Python call per record.
+    Unlike the streaming scans, a malformed line raises instead of being skipped.
+    """
+    scan_limit = _scan_limit(config)
+    builder = ArxivCandidatesBuilder()
+
+    scanned_count = 0
+
+    reader = pd.read_json(data_path, lines=True, chunksize=_VECTORIZED_CHUNK_SIZE, dtype=False, convert_dates=False)
+    with reader:
+        pbar = tqdm(reader, desc="Scanning", unit="chunks")
+        for chunk in pbar:
+            if scan_limit is not None:
+                chunk = chunk.iloc[:scan_limit - scanned_count]
+            scanned_count += len(chunk)
+
+            matches = chunk.reindex(columns=list(CANDIDATE_FIELDS))[_filter_mask(chunk, config)]
+            # Missing fields and JSON nulls both come back as NaN; leave them out of the record
+            matches = matches.astype(object).where(matches.notna(), None)
+            builder.extend({k: v for k, v in record.items() if v is not None} for record in matches.to_dict('records'))
+            pbar.set_postfix({"Found": len(builder)})
+
+            if scan_limit is not None and scanned_count >= scan_limit:
+                break
+
+    return builder.build()
+
+
+def _filter_mask(chunk: pd.DataFrame, config: Dict[str, Any]) -> pd.Series:
+    """
+    Vectorized filter_arxiv_metadata: a boolean mask of the records in chunk that pass.
+    """
+    def column(name: str) -> pd.Series:
+        return chunk[name].fillna('').astype(str) if name in chunk else pd.Series('', index=chunk.index)
+
+    def contains_any(values: pd.Series, terms: List[str]) -> pd.Series:
+        return values.str.contains('|'.join(re.escape(term) for term in terms), regex=True)
+
+    # check categories (whitespace-separated tokens)
+    allowed_categories = config.get('allowed_categories', ["cs.LG", "stat.ML"])
+    if not allowed_categories:
+        return pd.Series(False, index=chunk.index)
+    category_pattern = r'(?:^|\s)(?:' + '|'.join(re.escape(c) for c in allowed_categories) + r')(?:\s|$)'
+    mask = column('categories').str.contains(category_pattern, regex=True)
+
+    # check date; records without a date pass, unparseable dates fail
+    min_date_str = config.get('min_date')
+    if min_date_str:
+        dates = column('update_date')
+        has_date = dates != ''
+        parsed = pd.to_datetime(dates.where(has_date), errors='coerce', format='ISO8601')
+        mask &= ~has_date | (parsed >= pd.Timestamp(min_date_str))
+
+    # published check
+    if config.get('is_published', False):
+        mask &= column('doi') != ''
+
+    # is method check
+    title_text = column('title').str.lower()
+    exclude_terms = config.get('exclude_title_keywords', [])
+    if exclude_terms:
+        mask &= ~contains_any(title_text, exclude_terms)
+
+    # abstract and title keywords check
+    include_keywords = [kw.lower() for kw in config.get('title_abstract_keywords', [])]
+    if include_keywords:
+        abstract_text = column('abstract').str.lower()
+        mask &= contains_any(abstract_text, include_keywords) | contains_any(title_text, include_keywords)
+
+    return mask
+
+
+def _scan_shard(data_path: Path, start: int, end: int, config: Dict[str, Any]) -> List[Dict]:
+    """
+    Worker: returns the records in one byte range that pass filter_arxiv_metadata.
+    """
+    return [
+        paper for paper in stream_arxiv_data(data_path, fields=CANDIDATE_FIELDS, start=start, end=end)
+        if filter_arxiv_metadata(paper, config)
+    ]
+
+
 def filter_arxiv_metadata(paper: Dict, config: Dict[str, Any]) -> bool:
     """
     Arxiv paper metadata filtering logic.
@@ -57,8 +199,8 @@ def filter_arxiv_metadata(paper: Dict, config: Dict[str, Any]) -> bool:
 
     # check categories
     paper_categories = paper.get('categories', '').split()
-    allowed_categories = config.get('allowed_categories', ["cs.LG", "stat.ML"])
-    if not set(paper_categories).intersection(set(allowed_categories)):
+    allowed_categories = _as_frozenset(tuple(config.get('allowed_categories', ["cs.LG", "stat.ML"])))
+    if allowed_categories.isdisjoint(paper_categories):
         return False
 
     # check date
@@ -68,7 +210,7 @@ def filter_arxiv_metadata(paper: Dict, config: Dict[str, Any]) -> bool:
         if paper_date_str:
             try:
                 paper_date = datetime.datetime.fromisoformat(paper_date_str.replace('Z', '+00:00'))
-                min_date = datetime.datetime.fromisoformat(min_date_str.replace('Z', '+00:00'))
+                min_date = _parse_min_date(min_date_str)
                 if paper_date < min_date:
                     return False
             except (ValueError, AttributeError):
@@ -80,18 +222,41 @@ def filter_arxiv_metadata(paper: Dict, config: Dict[str, Any]) -> bool:
             return False
 
     # is method check
-    title = paper.get('title', '').lower()
+    title = paper.get('title', '')
     exclude_terms = config.get('exclude_title_keywords', [])
-    if any(term in title for term in exclude_terms):
+    if exclude_terms and _keyword_pattern(tuple(exclude_terms), False).search(title.lower()):
         return False
 
     # abstract and title keywords check
-    abstract_text = paper.get('abstract', '').lower()
-    title_text = paper.get('title', '').lower()
     include_keywords = config.get('title_abstract_keywords', [])
     if include_keywords:
         # Check if keywords appear in either abstract or title
-        if not any(kw.lower() in abstract_text or kw.lower() in title_text for kw in include_keywords):
+        pattern = _keyword_pattern(tuple(include_keywords), True)
+        if not (pattern.search(paper.get('abstract', '')) or pattern.search(title)):
             return False
     
-    return True
\ No newline at end of file
+    return True
+
+
+# filter_arxiv_metadata runs once per record; the helpers below cache the per-config work
+
+@functools.lru_cache(maxsize=32)
+def _as_frozenset(values: Tuple[str, ...]) -> FrozenSet[str]:
+    return frozenset(values)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_min_date(min_date_str: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(min_date_str.replace('Z', '+00:00'))
+
+
+@functools.lru_cache(maxsize=32)
+def _keyword_pattern(keywords: Tuple[str, ...], ignore_case: bool) -> re.Pattern:
+    """
+    One regex alternation matching any of the keywords, so each text is scanned once.
+    Longer keywords come first so overlapping alternatives do not shadow them.
+    """
+    if ignore_case:
+        keywords = tuple(kw.lower() for kw in keywords)
+    alternation = '|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+    return re.compile(alternation, re.IGNORECASE if ignore_case else 0)
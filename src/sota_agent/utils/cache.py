@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+
+def default_cache_dir() -> Path:
+    """
+    Directory for persistent caches. Override with the SOTA_AGENT_CACHE_DIR environment variable.
+    """
+    return Path(os.environ.get('SOTA_AGENT_CACHE_DIR', Path.home() / '.cache' / 'sota_agent'))
+
+
+class DiskCache:
+    """
+    Small persistent key-value cache backed by SQLite, with optional per-entry expiry.
+    Values must be JSON-serializable. Safe to share between threads; the database
+    file is only created on first use.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a cached value, or default if missing or expired.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return default
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return default
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None):
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            expire: Seconds until the entry expires (None = never)
+        """
+        expires_at = time.time() + expire if expire is not None else None
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at),
+                )
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,20 +1,55 @@
-import json
+import mmap
 from pathlib import Path
-from typing import Dict, Generator
+from typing import Dict, Generator, List, Optional, Sequence, Tuple
 
+from sota_agent.utils.json_backend import loads, JSONDecodeError
 
-def stream_arxiv_data(file_path: Path) -> Generator[Dict, None, None]:
+
+def stream_arxiv_data(
+    file_path: Path,
+    fields: Optional[Sequence[str]] = None,
+    start: int = 0,
+    end: Optional[int] = None
+) -> Generator[Dict, None, None]:
     """
     Reads the ArXiv JSON file line-by-line.
+    If fields is given, each record is trimmed to those keys.
+    start/end restrict reading to a line-aligned byte range (see split_line_aligned).
     """
     if not file_path.exists():
         raise FileNotFoundError(f"Data file not found at: {file_path}")
         
-    with open(file_path, 'r') as f:
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        position = start
         for line in f:
+            if end is not None and position >= end:
+                break
+            position += len(line)
             try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
+                record = loads(line)
+            except JSONDecodeError:
                 continue
+            if fields is not None:
+                record = {k: record[k] for k in fields if k in record}
+            yield record
 
 
+def split_line_aligned(file_path: Path, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Splits a JSONL file into at most n_shards (start, end) byte ranges that begin and end on line boundaries.
+    """
+    size = file_path.stat().st_size
+    if size == 0:
+        return []
+    
+    bounds = [0]
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, n_shards):
+            newline = mm.find(b'\n', max(i * size // n_shards, bounds[-1]))
+            if newline == -1 or newline + 1 >= size:
+                break
+            bounds.append(newline + 1)
+    bounds.append(size)
+    
+    return list(zip(bounds[:-1], bounds[1:]))
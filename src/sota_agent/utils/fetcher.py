@@ -1,4 +1,7 @@
+import re
 import gzip
+import shutil
+import sqlite3
 import tarfile
 import requests
 import tempfile
@@ -6,13 +9,24 @@ from pathlib import Path
 import xml.etree.ElementTree as ET
 from typing import Optional, Dict, Any
 
+from sota_agent.utils.cache import DiskCache, default_cache_dir
 
-def fetch_arxiv_metadata(arxiv_id: str) -> Optional[Dict[str, Any]]:
+# Persistent cache of parsed ArXiv API responses, keyed by arxiv_id
+_METADATA_CACHE = DiskCache(default_cache_dir() / 'arxiv_metadata.sqlite')
+_METADATA_CACHE_TTL = 7 * 24 * 3600  # one week
+
+# Pattern for \input{filename} (no extension or .tex extension), compiled once
+_INPUT_RE = re.compile(r'\\input\{([^}]+)\}')
+
+
+def fetch_arxiv_metadata(arxiv_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
     """
     Fetches metadata for an ArXiv paper using the ArXiv API.
+    Successful responses are cached on disk for a week.
     
     Args:
         arxiv_id: ArXiv paper ID (e.g., "2301.12345" or "1706.03762")
+        use_cache: If True, serve from and store to the on-disk metadata cache
         
     Returns:
         Dictionary with metadata (title, authors, abstract, published, updated, categories)
@@ -21,6 +35,14 @@ def fetch_arxiv_metadata(arxiv_id: str) -> Optional[Dict[str, Any]]:
     # Clean the arxiv_id
     arxiv_id = arxiv_id.replace('arxiv:', '').strip()
     
+    if use_cache:
+        try:
+            cached = _METADATA_CACHE.get(arxiv_id)
+            if cached is not None:
+                return cached
+        except (sqlite3.Error, OSError) as e:
+            print(f"Metadata cache unavailable: {e}")
+    
     # ArXiv API URL
     api_url = f"http://export.arxiv.org/api/query?id_list={arxiv_id}"
     
@@ -97,6 +119,12 @@ def fetch_arxiv_metadata(arxiv_id: str) -> Optional[Dict[str, Any]]:
         if journal_ref is not None and journal_ref.text is not None:
             metadata['journal_ref'] = journal_ref.text.strip()
         
+        if use_cache:
+            try:
+                _METADATA_CACHE.set(arxiv_id, metadata, expire=_METADATA_CACHE_TTL)
+            except (sqlite3.Error, OSError) as e:
+                print(f"Metadata cache unavailable: {e}")
+        
         return metadata
         
     except Exception as e:
@@ -135,29 +163,29 @@ def download_arxiv_source(arxiv_id: str, output_dir: Path, timeout: int = 30) ->
         # print(f"Downloading source: {source_url}")
         response = requests.get(source_url, timeout=timeout, stream=True)
         response.raise_for_status()
-        
-        # Create temporary file for download
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.tar.gz') as tmp_file:
-            for chunk in response.iter_content(chunk_size=8192):
-                tmp_file.write(chunk)
-            tmp_path = tmp_file.name
+        # Undo any transport-level Content-Encoding (as iter_content would); the gzip
+        # payload itself is decompressed below, overlapping with the download.
+        response.raw.decode_content = True
         
         # Extract the archive
         source_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            # Try as tar.gz first
-            with tarfile.open(tmp_path, 'r:gz') as tar:
-                tar.extractall(source_dir)
-        except tarfile.ReadError:
-            # Try as gzip (single .tex file)
-            with gzip.open(tmp_path, 'rb') as gz:
-                content = gz.read()
-                # Save as main.tex
-                (source_dir / 'main.tex').write_bytes(content)
-        
-        # Clean up temp file
-        Path(tmp_path).unlink()
+            with gzip.GzipFile(fileobj=response.raw) as gz:
+                header = gz.read(tarfile.BLOCKSIZE)
+                if _is_tar_header(header):
+                    # Stream the tarball straight into extraction, no temp file
+                    with tarfile.open(fileobj=_PrefixedReader(header, gz), mode='r|') as tar:
+                        tar.extractall(source_dir)
+                else:
+                    # Single gzipped .tex file, save as main.tex
+                    with open(source_dir / 'main.tex', 'wb') as f:
+                        f.write(header)
+                        shutil.copyfileobj(gz, f)
+        except Exception:
+            # Don't leave a partial extraction behind, it would be treated as downloaded
+            shutil.rmtree(source_dir, ignore_errors=True)
+            raise
         
         # print(f"Extracted to: {source_dir}")
         return source_dir
@@ -170,6 +198,39 @@ def download_arxiv_source(arxiv_id: str, output_dir: Path, timeout: int = 30) ->
         return None
 
 
+def _is_tar_header(block: bytes) -> bool:
+    """
+    Checks whether a decompressed block starts with a valid tar header.
+    """
+    try:
+        tarfile.TarInfo.frombuf(block, tarfile.ENCODING, 'surrogateescape')
+        return True
+    except tarfile.HeaderError:
+        return False
+
+
+class _PrefixedReader:
+    """
+    Minimal read-only file object that replays already-consumed bytes
+    before continuing with the underlying stream.
+    """
+    
+    def __init__(self, prefix: bytes, stream):
+        self._prefix = prefix
+        self._stream = stream
+    
+    def read(self, size: int = -1) -> bytes:
+        if not self._prefix:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._prefix = self._prefix + self._stream.read(), b''
+            return data
+        data, self._prefix = self._prefix[:size], self._prefix[size:]
+        if len(data) < size:
+            data += self._stream.read(size - len(data))
+        return data
+
+
 def find_main_tex_file(source_dir: Path) -> Optional[Path]:
     """
     Finds the main .tex file in a source directory.
@@ -256,10 +317,9 @@ def _resolve_latex_inputs(text: str, base_dir: Path) -> str:
     Returns:
         LaTeX text with all inputs resolved
     """
-    import re
-    
-    # Pattern for \input{filename} (no extension or .tex extension)
-    input_pattern = r'\\input\{([^}]+)\}'
+    # Cheap substring check first; most included files have no \input at all
+    if '\\input' not in text:
+        return text
     
     def replace_input(match):
         filename = match.group(1)
@@ -304,7 +364,7 @@ def _resolve_latex_inputs(text: str, base_dir: Path) -> str:
             return match.group(0)
     
     # Replace all \input commands
-    resolved_text = re.sub(input_pattern, replace_input, text)
+    resolved_text = _INPUT_RE.sub(replace_input, text)
     
     return resolved_text
 
@@ -367,7 +427,6 @@ def fetch_arxiv_paper(arxiv_id: str, parsed_papers_dir: Path, output_dir: Path,
     finally:
         # Clean up temp directory if needed
         if cleanup_dir and cleanup_dir.exists():
-            import shutil
             shutil.rmtree(cleanup_dir)
             # print("Cleaned up temporary source files")
     
@@ -1,14 +1,30 @@
 import sys
+import copy
 import yaml
+import functools
 from pathlib import Path
 from typing import Dict, Any
 from dotenv import dotenv_values
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 def get_google_ids_from_dotenv() -> Dict[str, str]:
     return {k: v for k, v in dotenv_values().items() if v is not None}
 
 
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path_str: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parses the YAML file. Cached by (path, mtime) so edits to the file are picked up.
+    """
+    with open(path_str, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 def load_config(config_path: Path) -> Dict[str, Any]:
     """
     Loads the YAML configuration file.
@@ -16,8 +32,9 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found at: {config_path}")
     try:
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+        mtime = config_path.stat().st_mtime
+        # callers may mutate the returned config, so hand out a copy of the cached parse
+        return copy.deepcopy(_load_config_cached(str(config_path.resolve()), mtime))
     except Exception as e:
         print(f"Config Error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -2,10 +2,15 @@ import PyPDF2
 import requests
 import tempfile
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from sota_agent.model.pdf_paper import ArxivPdfPaper
 
+try:
+    import pymupdf  # much faster text extraction than PyPDF2
+except ImportError:
+    pymupdf = None
+
 
 def download_pdf_from_arxiv(arxiv_id: str, output_dir: Path, timeout: int = 30) -> Optional[Path]:
     """
@@ -52,7 +57,8 @@ def download_pdf_from_arxiv(arxiv_id: str, output_dir: Path, timeout: int = 30)
 def extract_text_from_pdf(pdf_path: Path, max_pages: int = 10) -> str:
     """
     Quickly extract text from PDF for keyword filtering.
-    Only extracts first N pages for efficiency.
+    Only extracts first N pages for efficiency. Uses PyMuPDF when installed,
+    otherwise falls back to PyPDF2.
     
     Args:
         pdf_path: Path to PDF file
@@ -65,21 +71,10 @@ def extract_text_from_pdf(pdf_path: Path, max_pages: int = 10) -> str:
         return ""
     
     try:
-        text_parts = []
-        with open(pdf_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            num_pages = len(reader.pages)
-            pages_to_extract = min(max_pages, num_pages)
-            
-            for page_num in range(pages_to_extract):
-                try:
-                    page = reader.pages[page_num]
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-                except Exception:
-                    # Skip problematic pages
-                    continue
+        if pymupdf is not None:
+            text_parts = _extract_text_with_pymupdf(pdf_path, max_pages)
+        else:
+            text_parts = _extract_text_with_pypdf2(pdf_path, max_pages)
         
         return " ".join(text_parts)
         
@@ -88,11 +83,51 @@ def extract_text_from_pdf(pdf_path: Path, max_pages: int = 10) -> str:
         return ""
 
 
+def _extract_text_with_pymupdf(pdf_path: Path, max_pages: int) -> List[str]:
+    """
+    Extracts text from the first max_pages pages using PyMuPDF.
+    """
+    text_parts = []
+    with pymupdf.open(pdf_path) as doc:
+        for page_num in range(min(max_pages, doc.page_count)):
+            try:
+                text = doc.load_page(page_num).get_text('text')
+                if text:
+                    text_parts.append(text)
+            except Exception:
+                # Skip problematic pages
+                continue
+    return text_parts
+
+
+def _extract_text_with_pypdf2(pdf_path: Path, max_pages: int) -> List[str]:
+    """
+    Extracts text from the first max_pages pages using PyPDF2.
+    """
+    text_parts = []
+    with open(pdf_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        num_pages = len(reader.pages)
+        pages_to_extract = min(max_pages, num_pages)
+        
+        for page_num in range(pages_to_extract):
+            try:
+                page = reader.pages[page_num]
+                text = page.extract_text()
+                if text:
+                    text_parts.append(text)
+            except Exception:
+                # Skip problematic pages
+                continue
+    return text_parts
+
+
 def fetch_paper_from_arxiv(
     arxiv_id: str, 
     paper_metadata: Dict[str, Any],
     pdf_dir: Path, 
-    keep_pdf: bool = True
+    keep_pdf: bool = True,
+    extract_text: bool = True
 ) -> Optional['ArxivPdfPaper']:
     """
     Downloads ArXiv paper PDF and creates ArxivPdfPaper object.
@@ -102,6 +137,8 @@ def fetch_paper_from_arxiv(
         paper_metadata: Metadata dict from arxiv dataset scan
         pdf_dir: Directory to save PDF files
         keep_pdf: If True, keeps PDF. If False, uses temp directory
+        extract_text: If True, extracts filtering text now. If False, the caller is
+            responsible for setting raw_text (e.g. from a background extraction)
         
     Returns:
         ArxivPdfPaper object or None if download failed
@@ -130,7 +167,8 @@ def fetch_paper_from_arxiv(
         )
         
         # Extract text for filtering
-        pdf_paper.raw_text = extract_text_from_pdf(pdf_path, max_pages=10)
+        if extract_text:
+            pdf_paper.raw_text = extract_text_from_pdf(pdf_path, max_pages=10)
         
         # If not keeping PDF, store temporary path for later Gemini upload
         if not keep_pdf:
@@ -3,6 +3,30 @@ Shared pytest fixtures and configuration for all tests.
 """
 import pytest
 from pathlib import Path
+from unittest.mock import Mock, patch
+
+from sota_agent.model.pdf_paper import ArxivPdfPaper
+from sota_agent.utils.cache import DiskCache
+from sota_agent.utils.fetcher import fetch_arxiv_paper
+
+
+def pytest_addoption(parser):
+    parser.addoption("--runnetwork", action="store_true", default=False,
+                     help="run tests marked network (real arXiv downloads)")
+    parser.addoption("--runbenchmark", action="store_true", default=False,
+                     help="run tests marked benchmark (wall-clock timing checks)")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip network- and benchmark-marked tests unless --runnetwork / --runbenchmark is given."""
+    for marker in ("network", "benchmark"):
+        option = f"--run{marker}"
+        if config.getoption(option):
+            continue
+        skip = pytest.mark.skip(reason=f"needs {option}")
+        for item in items:
+            if marker in item.keywords:
+                item.add_marker(skip)
 
 
 @pytest.fixture(scope="session")
@@ -29,3 +53,34 @@ def temp_output_dir(tmp_path):
     output_dir = tmp_path / "output"
     output_dir.mkdir(exist_ok=True)
     return output_dir
+
+
+@pytest.fixture(scope="session")
+def _session_arxiv_paper():
+    """Build the spec'd ArxivPdfPaper mock once; spec introspection is the slow part."""
+    return Mock(spec=ArxivPdfPaper)
+
+
+@pytest.fixture
+def fake_arxiv_paper(_session_arxiv_paper):
+    """Shared ArxivPdfPaper mock, reset before each test that uses it."""
+    _session_arxiv_paper.reset_mock(return_value=True, side_effect=True)
+    return _session_arxiv_paper
+
+
+@pytest.fixture(scope="session")
+def transformer_paper_fetch(tmp_path_factory):
+    """
+    Download and extract the LaTeX source of arXiv 1706.03762 (Attention Is All You Need)
+    once per session. Tests must treat the result and source directory as read-only.
+    Skipped when arXiv cannot be reached. Metadata goes through a throwaway cache, so the
+    real API is queried and the developer's ~/.cache/sota_agent is left untouched.
+    """
+    output_dir = tmp_path_factory.mktemp("transformer_paper")
+    metadata_cache = DiskCache(tmp_path_factory.mktemp("metadata_cache") / 'arxiv_metadata.sqlite')
+    with patch('sota_agent.utils.fetcher._METADATA_CACHE', metadata_cache):
+        result = fetch_arxiv_paper("1706.03762", output_dir, output_dir)
+    metadata_cache.close()
+    if result['text'] is None:
+        pytest.skip("arXiv source for 1706.03762 could not be fetched (offline?)")
+    return output_dir, result
@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import Mock, patch
+from concurrent.futures import Future
 
-from sota_agent.arxiv_download import download_arxiv_papers
+from sota_agent.arxiv_download import _save_extracted, download_arxiv_papers
 from sota_agent.model.pdf_paper import ArxivPdfPaper
 
 
@@ -33,26 +34,26 @@ def sample_candidates():
     ]
 
 
+@patch('sota_agent.arxiv_download.time.sleep')
+@patch('sota_agent.arxiv_download.fetch_paper_from_arxiv', autospec=True)
 class TestArxivDownload:
     """Test suite for arXiv download functionality."""
 
-    @patch('sota_agent.arxiv_download.fetch_paper_from_arxiv')
     def test_download_arxiv_papers_creates_directories(
-        self, mock_fetch, mock_config, mock_paths, sample_candidates
+        self, mock_fetch, mock_sleep, mock_config, mock_paths, sample_candidates, fake_arxiv_paper
     ):
         """Test that required directories are created."""
-        mock_fetch.return_value = Mock(spec=ArxivPdfPaper)
+        mock_fetch.return_value = fake_arxiv_paper
         
         download_arxiv_papers(mock_config, sample_candidates, mock_paths)
         
         assert mock_paths['PARSED_PAPERS'].exists()
 
-    @patch('sota_agent.arxiv_download.fetch_paper_from_arxiv')
     def test_download_respects_max_calls(
-        self, mock_fetch, mock_config, mock_paths, sample_candidates
+        self, mock_fetch, mock_sleep, mock_config, mock_paths, sample_candidates, fake_arxiv_paper
     ):
         """Test that max_download_calls is respected."""
-        mock_fetch.return_value = Mock(spec=ArxivPdfPaper)
+        mock_fetch.return_value = fake_arxiv_paper
         mock_config['max_download_calls'] = 1
         
         download_arxiv_papers(mock_config, sample_candidates, mock_paths)
@@ -60,12 +61,11 @@ class TestArxivDownload:
         # Should only call fetch once despite having 2 candidates
         assert mock_fetch.call_count <= 1
 
-    @patch('sota_agent.arxiv_download.fetch_paper_from_arxiv')
     def test_download_with_no_limit(
-        self, mock_fetch, mock_config, mock_paths, sample_candidates
+        self, mock_fetch, mock_sleep, mock_config, mock_paths, sample_candidates, fake_arxiv_paper
     ):
         """Test download with no limit (-1)."""
-        mock_fetch.return_value = Mock(spec=ArxivPdfPaper)
+        mock_fetch.return_value = fake_arxiv_paper
         mock_config['max_download_calls'] = -1
         
         download_arxiv_papers(mock_config, sample_candidates, mock_paths)
@@ -73,7 +73,64 @@ class TestArxivDownload:
         # Should call fetch for all candidates
         assert mock_fetch.call_count == len(sample_candidates)
 
-    def test_download_with_empty_candidates(self, mock_config, mock_paths):
+    def test_download_with_empty_candidates(self, mock_fetch, mock_sleep, mock_config, mock_paths):
         """Test download with empty candidate list."""
         result = download_arxiv_papers(mock_config, [], mock_paths)
         assert result == []
+        mock_fetch.assert_not_called()
+
+    def test_download_saves_papers_after_text_extraction(
+        self, mock_fetch, mock_sleep, mock_config, mock_paths, sample_candidates
+    ):
+        """Test that background-extracted text is set before parsed papers are saved."""
+        mock_fetch.side_effect = lambda arxiv_id, metadata, *args, **kwargs: ArxivPdfPaper(
+            arxiv_id, pdf_path=mock_paths['SOURCES'] / f"{arxiv_id}.pdf", metadata=metadata
+        )
+
+        result = download_arxiv_papers(mock_config, sample_candidates, mock_paths)
+
+        assert [paper.arxiv_id for paper in result] == ['2101.00001', '2101.00002']
+        # PDFs don't exist, so extraction yields empty text rather than None
+        assert all(paper.raw_text == "" for paper in result)
+        assert (mock_paths['PARSED_PAPERS'] / '2101.00001.json').exists()
+        assert mock_fetch.call_args.kwargs['extract_text'] is False
+
+    def test_download_saves_each_paper_before_later_downloads(
+        self, mock_fetch, mock_sleep, mock_config, mock_paths, capsys
+    ):
+        """Test that papers are saved during the run, extracted in the process pool, so an interrupted run can resume."""
+        candidates = [{'id': f'2101.0000{i}', 'title': f'Test Paper {i}'} for i in range(1, 4)]
+        saved_before_fetch = {}
+
+        def fetch(arxiv_id, metadata, *args, **kwargs):
+            saved_before_fetch[arxiv_id] = sorted(p.stem for p in mock_paths['PARSED_PAPERS'].glob('2101.*.json'))
+            return ArxivPdfPaper(arxiv_id, pdf_path=mock_paths['SOURCES'] / f"{arxiv_id}.pdf", metadata=metadata)
+
+        mock_fetch.side_effect = fetch
+
+        download_arxiv_papers({**mock_config, 'extract_workers': 1}, candidates, mock_paths)
+
+        # With one extraction worker, paper 1 must be saved before paper 3 is downloaded
+        assert '2101.00001' in saved_before_fetch['2101.00003']
+        assert sorted(p.stem for p in mock_paths['PARSED_PAPERS'].glob('2101.*.json')) == [
+            '2101.00001', '2101.00002', '2101.00003'
+        ]
+        assert "Background text extraction failed" not in capsys.readouterr().out
+
+
+class TestSaveExtracted:
+    """Test suite for collecting background text extractions."""
+
+    def test_leaves_up_to_max_pending_running(self, tmp_path):
+        """Test that finished extractions are saved while up to max_pending unfinished ones keep running."""
+        futures = [Future() for _ in range(4)]
+        futures[0].set_result('text 0')
+        futures[2].set_result('text 2')
+        pending = [(str(i), Mock(spec=ArxivPdfPaper), tmp_path / f'{i}.json', future) for i, future in enumerate(futures)]
+
+        still_pending = _save_extracted(pending, save_parsed=True, max_pending=3)
+
+        assert [item[0] for item in still_pending] == ['1', '3']
+        assert pending[0][1].raw_text == 'text 0'
+        pending[2][1].save_to_json.assert_called_once_with(tmp_path / '2.json')
+        pending[1][1].save_to_json.assert_not_called()
@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import patch
+
+from sota_agent.utils.cache import DiskCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A disk cache in a temporary directory."""
+    disk_cache = DiskCache(tmp_path / 'cache' / 'test.sqlite')
+    yield disk_cache
+    disk_cache.close()
+
+
+class TestDiskCache:
+    """Test suite for the SQLite-backed disk cache."""
+
+    def test_set_and_get(self, cache):
+        """Test that stored values are returned."""
+        cache.set('2101.00001', {'title': 'Test Paper', 'authors': ['A', 'B']})
+
+        assert cache.get('2101.00001') == {'title': 'Test Paper', 'authors': ['A', 'B']}
+        assert '2101.00001' in cache
+
+    def test_missing_key_returns_default(self, cache):
+        """Test that a missing key returns the default."""
+        assert cache.get('missing') is None
+        assert cache.get('missing', default={}) == {}
+
+    def test_expired_entry_is_ignored(self, cache):
+        """Test that expired entries are treated as missing."""
+        with patch('sota_agent.utils.cache.time.time', return_value=1000.0):
+            cache.set('key', 'value', expire=10)
+        with patch('sota_agent.utils.cache.time.time', return_value=1011.0):
+            assert cache.get('key') is None
+
+    def test_persists_across_instances(self, cache):
+        """Test that values survive reopening the database."""
+        cache.set('key', [1, 2, 3])
+        cache.close()
+
+        assert DiskCache(cache.path).get('key') == [1, 2, 3]
+
+    def test_database_created_lazily(self, tmp_path):
+        """Test that constructing a cache does not touch the filesystem."""
+        path = tmp_path / 'lazy' / 'cache.sqlite'
+        DiskCache(path)
+
+        assert not path.parent.exists()
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from sota_agent.model.candidates import ArxivCandidates
+
+
+@pytest.fixture
+def sample_records():
+    """Sample metadata records as they come out of the arXiv dump."""
+    return [
+        {
+            'id': '2101.00001',
+            'title': 'Machine Learning Methods',
+            'authors': 'Author A',
+            'abstract': 'This paper discusses ML techniques.',
+            'categories': 'cs.LG',
+            'update_date': '2021-01-01',
+            'doi': None,
+            'versions': [{'version': 'v1'}],
+        },
+        {
+            'id': '2101.00002',
+            'title': 'Deep Learning for Vision',
+            'categories': 'cs.CV',
+        },
+    ]
+
+
+class TestArxivCandidates:
+    """Test suite for the columnar candidate container."""
+
+    def test_rows_round_trip(self, sample_records):
+        """Test that rows come back as metadata dicts with only candidate fields."""
+        candidates = ArxivCandidates.from_records(sample_records)
+
+        assert len(candidates) == 2
+        assert candidates[0] == {
+            'id': '2101.00001',
+            'title': 'Machine Learning Methods',
+            'authors': 'Author A',
+            'abstract': 'This paper discusses ML techniques.',
+            'categories': 'cs.LG',
+            'update_date': '2021-01-01',
+            'doi': None,
+        }
+
+    def test_missing_fields_are_left_out(self, sample_records):
+        """Test that fields absent from the record, including dates, are absent from the row."""
+        row = ArxivCandidates.from_records(sample_records)[1]
+
+        assert row == {'id': '2101.00002', 'title': 'Deep Learning for Vision', 'categories': 'cs.CV'}
+        assert row.get('update_date', 'N/A') == 'N/A'
+
+    def test_slice_returns_candidates(self, sample_records):
+        """Test that slicing keeps the columnar container."""
+        candidates = ArxivCandidates.from_records(sample_records)[:1]
+
+        assert isinstance(candidates, ArxivCandidates)
+        assert [row['id'] for row in candidates] == ['2101.00001']
+
+    def test_unparseable_date_is_kept_as_is(self):
+        """Test that dates not in YYYY-MM-DD form come back exactly as given."""
+        candidates = ArxivCandidates.from_records([
+            {'id': '1', 'update_date': 'not-a-date'},
+            {'id': '2', 'update_date': '2021-01-01T12:00:00'},
+            {'id': '3', 'update_date': None},
+            {'id': '4', 'update_date': '2021-01-01'},
+        ])
+
+        assert [row['update_date'] for row in candidates] == ['not-a-date', '2021-01-01T12:00:00', None, '2021-01-01']
+        assert [row['update_date'] for row in candidates[1:3]] == ['2021-01-01T12:00:00', None]
+        assert candidates.update_dates[1] == np.datetime64('2021-01-01')
+
+    def test_empty(self):
+        """Test that an empty container is falsy."""
+        assert not ArxivCandidates.from_records([])
@@ -0,0 +1,356 @@
+import json
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from google.genai import errors as genai_errors
+from tenacity import wait_none
+
+from pydantic import BaseModel
+
+from sota_agent.client import GeminiAgentClient, _SOTA_SCHEMA, _slim_schema
+from sota_agent.model.pdf_paper import ArxivPdfPaper
+from sota_agent.utils.cache import DiskCache
+
+
+@pytest.fixture
+def llm_config():
+    """Mock LLM extraction configuration."""
+    return {
+        'selected_dataset_names': ['Waterbirds'],
+        'metrics': {'Worst-Group Accuracy': 'Lowest accuracy across any subgroup.'},
+        'taxonomy_hierarchy': {'Data-Centric': ['Data Augmentation', 'Others']},
+    }
+
+
+@pytest.fixture
+def sota_response_text():
+    """A valid JSON response for SOTAEntry."""
+    return json.dumps({
+        'paper_title': 'test paper',
+        'application_field': 'general',
+        'domain': 'Computer Vision',
+        'paper_type': 'Method',
+        'taxonomy_level_1': 'Data-Centric',
+        'taxonomy_level_2': 'Data Augmentation',
+        'method': 'TestAug',
+        'metric_value': '91.5%',
+        'evidence': 'Table 1',
+        'dataset_mentioned': True,
+    })
+
+
+@pytest.fixture(autouse=True)
+def response_cache(tmp_path):
+    """Replace the persistent LLM response cache with one in a temporary directory."""
+    cache = DiskCache(tmp_path / 'llm_responses.sqlite')
+    with patch('sota_agent.client._RESPONSE_CACHE', cache):
+        yield cache
+    cache.close()
+
+
+@pytest.fixture
+def agent_client():
+    """A GeminiAgentClient whose underlying genai client is mocked."""
+    client = GeminiAgentClient(google_api_key='test-key')
+    client.client = Mock()
+    return client
+
+
+@pytest.fixture
+def no_retry_wait(monkeypatch):
+    """Skip the backoff sleeps between retried LLM calls."""
+    monkeypatch.setattr(GeminiAgentClient._generate_content.retry, 'wait', wait_none())
+    monkeypatch.setattr(GeminiAgentClient._generate_content_async.retry, 'wait', wait_none())
+
+
+def api_error(code: int) -> genai_errors.APIError:
+    return genai_errors.APIError(code, {'error': {'code': code, 'message': 'error', 'status': 'ERROR'}})
+
+
+def make_pdf_paper(arxiv_id: str, raw_text: str = '') -> Mock:
+    """Create a mock PDF paper that 'uploads' to a fake file handle."""
+    paper = Mock(spec=ArxivPdfPaper)
+    paper.arxiv_id = arxiv_id
+    paper.metadata = {'id': arxiv_id, 'title': f'Paper {arxiv_id}'}
+    paper.get_raw_text.return_value = raw_text
+    paper.get_pdf_path_for_upload.return_value = None
+    paper.upload_to_gemini.return_value = f'file-{arxiv_id}'
+    return paper
+
+
+class TestGeminiAgentClient:
+    """Test suite for the Gemini extraction client."""
+
+    def test_analyze_paper_from_pdf(self, agent_client, llm_config, sota_response_text):
+        """Test that a response is parsed and normalized into a SOTAEntry."""
+        agent_client.client.models.generate_content.return_value = Mock(text=sota_response_text)
+
+        entry = agent_client.analyze_paper_from_pdf(make_pdf_paper('2101.00001'), llm_config)
+
+        assert entry.paper_title == 'Test Paper'
+        assert entry.metric_value == pytest.approx(0.915)
+
+    def test_analyze_paper_failure_returns_none(self, agent_client, llm_config):
+        """Test that LLM errors are reported as None."""
+        agent_client.client.models.generate_content.side_effect = RuntimeError("boom")
+
+        assert agent_client.analyze_paper_from_pdf(make_pdf_paper('2101.00001'), llm_config) is None
+
+    def test_analyze_papers_concurrently(self, agent_client, llm_config, sota_response_text):
+        """Test that concurrent analysis keeps input order and caps requests in flight."""
+        in_flight, max_in_flight = 0, 0
+
+        async def fake_generate(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Mock(text=sota_response_text.replace('TestAug', kwargs['contents'][1]))
+
+        agent_client.client.aio.models.generate_content = AsyncMock(side_effect=fake_generate)
+        papers = [make_pdf_paper(f'2101.0000{i}') for i in range(6)]
+        completed = []
+
+        entries = asyncio.run(agent_client.analyze_papers_from_pdf(
+            papers, llm_config, max_concurrency=2, on_complete=lambda paper, entry: completed.append(paper)
+        ))
+
+        assert [entry.method for entry in entries] == [f'file-2101.0000{i}' for i in range(6)]
+        assert max_in_flight == 2
+        assert len(completed) == 6
+
+    def test_prompt_template_built_once(self, agent_client, llm_config):
+        """Test that the static prompt is reused across papers and only the title changes."""
+        GeminiAgentClient._build_prompt_template.cache_clear()
+
+        prompt_1 = agent_client._build_system_prompt(make_pdf_paper('2101.00001'), llm_config)
+        prompt_2 = agent_client._build_system_prompt(make_pdf_paper('2101.00002'), llm_config)
+
+        assert GeminiAgentClient._build_prompt_template.cache_info().misses == 1
+        assert 'TITLE: Paper 2101.00001\n' in prompt_1
+        assert prompt_1.replace('2101.00001', '2101.00002') == prompt_2
+
+    def test_invalid_json_response_returns_none(self, agent_client, llm_config):
+        """Test that malformed JSON from the LLM is treated as a failed extraction."""
+        agent_client.client.models.generate_content.return_value = Mock(text='{"paper_title": ')
+
+        assert agent_client.analyze_paper_from_pdf(make_pdf_paper('2101.00001'), llm_config) is None
+
+    def test_analyze_papers_batched(self, agent_client, llm_config, sota_response_text):
+        """Test that papers are sent in batches and entries come back aligned."""
+        entry = json.loads(sota_response_text)
+
+        async def fake_generate(**kwargs):
+            if len(kwargs['contents']) == 2:
+                return Mock(text=sota_response_text)
+            titles = [part for part in kwargs['contents'][1:] if str(part).startswith('[')]
+            return Mock(text=json.dumps([{**entry, 'method': title} for title in titles]))
+
+        agent_client.client.aio.models.generate_content = AsyncMock(side_effect=fake_generate)
+        papers = [make_pdf_paper(f'2101.0000{i}') for i in range(5)]
+
+        entries = asyncio.run(agent_client.analyze_papers_from_pdf(papers, llm_config, batch_size=2))
+
+        assert agent_client.client.aio.models.generate_content.await_count == 3
+        assert [e.method for e in entries] == [f'[{i % 2}] TITLE: Paper 2101.0000{i}' for i in range(4)] + ['TestAug']
+
+    def test_batch_mismatch_falls_back_to_single_requests(self, agent_client, llm_config, sota_response_text):
+        """Test that a batched response with the wrong length is retried paper by paper."""
+        async def fake_generate(**kwargs):
+            if len(kwargs['contents']) > 2:
+                return Mock(text=json.dumps([json.loads(sota_response_text)]))
+            return Mock(text=sota_response_text)
+
+        agent_client.client.aio.models.generate_content = AsyncMock(side_effect=fake_generate)
+        papers = [make_pdf_paper(f'2101.0000{i}') for i in range(3)]
+
+        entries = asyncio.run(agent_client.analyze_batch_from_pdf_async(papers, llm_config))
+
+        assert all(entry is not None for entry in entries)
+        # one batched request, then one request per paper
+        assert agent_client.client.aio.models.generate_content.await_count == 4
+
+    def test_genai_client_shared_per_api_key(self):
+        """Test that clients with the same API key reuse one genai client."""
+        client_a = GeminiAgentClient(google_api_key='shared-key')
+        client_b = GeminiAgentClient(google_api_key='shared-key', model_name='gemini-2.5-pro')
+
+        assert client_a.client is client_b.client
+        assert GeminiAgentClient(google_api_key='other-key').client is not client_a.client
+
+    def test_max_pdf_pages_passed_to_upload(self, agent_client, llm_config, sota_response_text):
+        """Test that the configured page cap is applied when uploading the PDF."""
+        agent_client.client.models.generate_content.return_value = Mock(text=sota_response_text)
+        paper = make_pdf_paper('2101.00001')
+
+        for max_pdf_pages in (8, -1, -2, 0):
+            agent_client.analyze_paper_from_pdf(paper, {**llm_config, 'max_pdf_pages': max_pdf_pages})
+        agent_client.analyze_paper_from_pdf(paper, llm_config)
+
+        assert [c.args[1] for c in paper.upload_to_gemini.call_args_list] == [8, None, None, None, None]
+
+    def test_transient_api_errors_are_retried(self, agent_client, llm_config, sota_response_text, no_retry_wait):
+        """Test that rate limits and unavailable errors are retried until the call succeeds."""
+        agent_client.client.aio.models.generate_content = AsyncMock(
+            side_effect=[api_error(429), api_error(503), Mock(text=sota_response_text)]
+        )
+
+        entry = asyncio.run(agent_client.analyze_paper_from_pdf_async(make_pdf_paper('2101.00001'), llm_config))
+
+        assert entry is not None
+        assert agent_client.client.aio.models.generate_content.await_count == 3
+
+    def test_client_errors_are_not_retried(self, agent_client, llm_config, no_retry_wait):
+        """Test that non-retryable API errors fail on the first attempt."""
+        agent_client.client.models.generate_content.side_effect = api_error(400)
+
+        assert agent_client.analyze_paper_from_pdf(make_pdf_paper('2101.00001'), llm_config) is None
+        assert agent_client.client.models.generate_content.call_count == 1
+
+    def test_invalid_json_is_not_retried(self, agent_client, llm_config, no_retry_wait):
+        """Test that schema/parse failures are not sent back to the model."""
+        agent_client.client.models.generate_content.return_value = Mock(text='not json')
+
+        assert agent_client.analyze_paper_from_pdf(make_pdf_paper('2101.00001'), llm_config) is None
+        assert agent_client.client.models.generate_content.call_count == 1
+
+    def test_response_schema_is_slim(self):
+        """Test that the response schema has no title annotations but keeps fields and descriptions."""
+        assert 'title' not in _SOTA_SCHEMA
+        assert 'title' not in _SOTA_SCHEMA['properties']['paper_title']
+        assert _SOTA_SCHEMA['properties']['metric_value'] == {
+            'description': 'Performance metric. Return -1.0 if not reported.', 'type': 'number'
+        }
+        assert _SOTA_SCHEMA['required'][0] == 'paper_title'
+
+    def test_slim_schema_inlines_defs(self):
+        """Test that nested model references are inlined and property names called 'title' survive."""
+        class Inner(BaseModel):
+            title: str
+
+        class Outer(BaseModel):
+            inner: Inner
+            items: list[Inner]
+
+        slim = _slim_schema(Outer.model_json_schema())
+
+        assert '$defs' not in slim
+        assert slim['properties']['inner'] == {
+            'properties': {'title': {'type': 'string'}}, 'required': ['title'], 'type': 'object'
+        }
+        assert slim['properties']['items']['items'] == slim['properties']['inner']
+
+    def test_papers_without_selected_dataset_are_skipped(self, agent_client, llm_config, sota_response_text):
+        """Test that papers whose text never mentions the dataset get no LLM call."""
+        agent_client.client.aio.models.generate_content = AsyncMock(return_value=Mock(text=sota_response_text))
+        papers = [
+            make_pdf_paper('2101.00001', raw_text='Results on WATERBIRDS and CelebA.'),
+            make_pdf_paper('2101.00002', raw_text='Results on ImageNet only.'),
+            make_pdf_paper('2101.00003', raw_text=''),
+        ]
+        completed = []
+
+        entries = asyncio.run(agent_client.analyze_papers_from_pdf(
+            papers, llm_config, on_complete=lambda paper, entry: completed.append(paper.arxiv_id)
+        ))
+
+        assert [entry is not None for entry in entries] == [True, False, True]
+        assert agent_client.client.aio.models.generate_content.await_count == 2
+        assert sorted(completed) == ['2101.00001', '2101.00002', '2101.00003']
+
+    @pytest.mark.parametrize('extra_config, expected', [
+        ({}, False),
+        ({'dataset_aliases': {'Waterbirds': ['CUB-Places']}}, True),
+        ({'prefilter_dataset': False}, True),
+    ])
+    def test_dataset_prefilter_config(self, llm_config, extra_config, expected):
+        """Test that aliases count as mentions and the prefilter can be turned off."""
+        paper = make_pdf_paper('2101.00001', raw_text='We evaluate on cub-places.')
+
+        assert GeminiAgentClient._mentions_selected_dataset(paper, {**llm_config, **extra_config}) is expected
+
+    def test_responses_cached_across_runs(self, agent_client, llm_config, sota_response_text, tmp_path):
+        """Test that an unchanged PDF and prompt are answered from the cache on the next run."""
+        agent_client.client.aio.models.generate_content = AsyncMock(return_value=Mock(text=sota_response_text))
+        paper = make_pdf_paper('2101.00001')
+        paper.get_pdf_path_for_upload.return_value = tmp_path / '2101.00001.pdf'
+        (tmp_path / '2101.00001.pdf').write_bytes(b'%PDF-1.5 content')
+
+        first = asyncio.run(agent_client.analyze_papers_from_pdf([paper], llm_config))
+        second = asyncio.run(agent_client.analyze_papers_from_pdf([paper], llm_config))
+        assert agent_client.client.aio.models.generate_content.await_count == 1
+        assert second == first
+
+        (tmp_path / '2101.00001.pdf').write_bytes(b'%PDF-1.5 changed content')
+        asyncio.run(agent_client.analyze_papers_from_pdf([paper], llm_config))
+        assert agent_client.client.aio.models.generate_content.await_count == 2
+
+    def test_response_cache_disabled(self, agent_client, llm_config, sota_response_text, tmp_path):
+        """Test that cache_responses: false always calls the model."""
+        agent_client.client.models.generate_content.return_value = Mock(text=sota_response_text)
+        paper = make_pdf_paper('2101.00001')
+        paper.get_pdf_path_for_upload.return_value = tmp_path / '2101.00001.pdf'
+        (tmp_path / '2101.00001.pdf').write_bytes(b'%PDF-1.5 content')
+        config = {**llm_config, 'cache_responses': False}
+
+        agent_client.analyze_paper_from_pdf(paper, config)
+        agent_client.analyze_paper_from_pdf(paper, config)
+
+        assert agent_client.client.models.generate_content.call_count == 2
+
+    def test_unusable_response_cache_does_not_abort_run(self, agent_client, llm_config, sota_response_text, tmp_path):
+        """Test that a cache directory that cannot be created only disables caching."""
+        agent_client.client.aio.models.generate_content = AsyncMock(return_value=Mock(text=sota_response_text))
+        (tmp_path / 'not_a_dir').write_bytes(b'')
+        paper = make_pdf_paper('2101.00001')
+        paper.get_pdf_path_for_upload.return_value = tmp_path / '2101.00001.pdf'
+        (tmp_path / '2101.00001.pdf').write_bytes(b'%PDF-1.5 content')
+
+        with patch('sota_agent.client._RESPONSE_CACHE', DiskCache(tmp_path / 'not_a_dir' / 'llm.sqlite')):
+            entries = asyncio.run(agent_client.analyze_papers_from_pdf([paper], llm_config))
+
+        assert entries[0] is not None
+
+    def test_unreadable_pdf_skips_cache(self, agent_client, llm_config, sota_response_text, tmp_path):
+        """Test that a PDF that cannot be hashed is still analyzed, without a cache key."""
+        agent_client.client.models.generate_content.return_value = Mock(text=sota_response_text)
+        paper = make_pdf_paper('2101.00001')
+        paper.get_pdf_path_for_upload.return_value = tmp_path  # a directory: exists, but open() fails
+
+        assert agent_client._response_cache_key(paper, llm_config) is None
+        assert agent_client.analyze_paper_from_pdf(paper, llm_config) is not None
+
+    def test_skipped_papers_are_not_hashed(self, agent_client, llm_config, sota_response_text):
+        """Test that only papers passing the dataset prefilter have their PDF hashed."""
+        agent_client.client.aio.models.generate_content = AsyncMock(return_value=Mock(text=sota_response_text))
+        papers = [
+            make_pdf_paper('2101.00001', raw_text='Results on Waterbirds.'),
+            make_pdf_paper('2101.00002', raw_text='Results on ImageNet only.'),
+        ]
+
+        with patch.object(GeminiAgentClient, '_response_cache_key', autospec=True, return_value=None) as mock_key:
+            asyncio.run(agent_client.analyze_papers_from_pdf(papers, llm_config))
+
+        assert [call.args[1].arxiv_id for call in mock_key.call_args_list] == ['2101.00001']
+
+    def test_batched_entries_are_not_cached(self, agent_client, llm_config, sota_response_text, tmp_path):
+        """Test that only answers to single-paper prompts are stored under the single-paper cache key."""
+        entry = json.loads(sota_response_text)
+
+        async def fake_generate(**kwargs):
+            if len(kwargs['contents']) == 2:
+                return Mock(text=sota_response_text)
+            titles = [part for part in kwargs['contents'][1:] if str(part).startswith('[')]
+            return Mock(text=json.dumps([{**entry, 'method': title} for title in titles]))
+
+        agent_client.client.aio.models.generate_content = AsyncMock(side_effect=fake_generate)
+        papers = [make_pdf_paper(f'2101.0000{i}') for i in range(3)]
+        for paper in papers:
+            paper.get_pdf_path_for_upload.return_value = tmp_path / f'{paper.arxiv_id}.pdf'
+            (tmp_path / f'{paper.arxiv_id}.pdf').write_bytes(f'%PDF-1.5 {paper.arxiv_id}'.encode())
+
+        asyncio.run(agent_client.analyze_papers_from_pdf(papers, llm_config, batch_size=2))
+
+        cached = [agent_client._get_cached_entry(agent_client._response_cache_key(p, llm_config)) for p in papers]
+        assert [entry is not None for entry in cached] == [False, False, True]
@@ -0,0 +1,98 @@
+import pytest
+
+from sota_agent.utils import json_backend
+from sota_agent.utils.data_ingester import stream_arxiv_data, split_line_aligned
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """A small JSONL metadata dump with one malformed line."""
+    path = tmp_path / 'arxiv-metadata.json'
+    path.write_text(
+        '{"id": "2101.00001", "title": "Paper 1", "versions": [{"version": "v1"}]}\n'
+        '{not valid json\n'
+        '{"id": "2101.00002", "title": "Paper 2", "abstract": "Caf\\u00e9"}\n'
+    )
+    return path
+
+
+class TestStreamArxivData:
+    """Test suite for streaming the arXiv metadata dump."""
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_stream_skips_malformed_lines(self, data_file, monkeypatch, use_orjson):
+        """Test that invalid JSON lines are skipped with either JSON backend."""
+        if use_orjson:
+            pytest.importorskip('orjson')
+        else:
+            monkeypatch.setattr(json_backend, 'orjson', None)
+
+        records = list(stream_arxiv_data(data_file))
+
+        assert [r['id'] for r in records] == ['2101.00001', '2101.00002']
+        assert records[1]['abstract'] == 'Café'
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_stream_decodes_raw_utf8(self, tmp_path, monkeypatch, use_orjson):
+        """Test that lines read as bytes are decoded as UTF-8 by either JSON backend."""
+        if use_orjson:
+            pytest.importorskip('orjson')
+        else:
+            monkeypatch.setattr(json_backend, 'orjson', None)
+        path = tmp_path / 'arxiv-metadata.json'
+        path.write_text('{"id": "2101.00003", "title": "Pap\u00e9r 3"}\n', encoding='utf-8')
+
+        assert list(stream_arxiv_data(path)) == [{'id': '2101.00003', 'title': 'Papér 3'}]
+
+    def test_stream_trims_to_fields(self, data_file):
+        """Test that records are trimmed to the requested fields."""
+        records = list(stream_arxiv_data(data_file, fields=('id', 'abstract')))
+
+        assert records == [{'id': '2101.00001'}, {'id': '2101.00002', 'abstract': 'Café'}]
+
+    def test_stream_missing_file(self, tmp_path):
+        """Test that a missing dump raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            next(stream_arxiv_data(tmp_path / 'missing.json'))
+
+    def test_stream_byte_range(self, data_file):
+        """Test that a byte range yields only the lines inside it."""
+        first_line_end = data_file.read_bytes().index(b'\n') + 1
+
+        head = list(stream_arxiv_data(data_file, start=0, end=first_line_end))
+        tail = list(stream_arxiv_data(data_file, start=first_line_end))
+
+        assert [r['id'] for r in head] == ['2101.00001']
+        assert [r['id'] for r in tail] == ['2101.00002']
+
+
+class TestSplitLineAligned:
+    """Test suite for splitting the dump into line-aligned shards."""
+
+    def test_shards_cover_file_on_line_boundaries(self, tmp_path):
+        """Test that shards are contiguous, non-empty and start on new lines."""
+        path = tmp_path / 'data.json'
+        data = b''.join(b'{"id": "%d", "pad": "%s"}\n' % (i, b'x' * (i % 7)) for i in range(100))
+        path.write_bytes(data)
+
+        shards = split_line_aligned(path, 8)
+
+        assert shards[0][0] == 0 and shards[-1][1] == len(data)
+        assert all(end == next_start for (_, end), (next_start, _) in zip(shards, shards[1:]))
+        assert all(start < end and data[start - 1:start] in (b'', b'\n') for start, end in shards)
+        records = [r for start, end in shards for r in stream_arxiv_data(path, start=start, end=end)]
+        assert [r['id'] for r in records] == [str(i) for i in range(100)]
+
+    def test_more_shards_than_lines(self, tmp_path):
+        """Test that a short file yields at most one shard per line."""
+        path = tmp_path / 'data.json'
+        path.write_bytes(b'{"id": "1"}\n{"id": "2"}\n')
+
+        assert len(split_line_aligned(path, 16)) <= 2
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file yields no shards."""
+        path = tmp_path / 'data.json'
+        path.write_bytes(b'')
+
+        assert split_line_aligned(path, 4) == []
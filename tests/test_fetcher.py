@@ -0,0 +1,172 @@
+import io
+import gzip
+import tarfile
+import pytest
+from unittest.mock import Mock, patch
+
+from sota_agent.utils.cache import DiskCache, default_cache_dir
+from sota_agent.utils.fetcher import (
+    _resolve_latex_inputs, download_arxiv_source, extract_text_from_latex, fetch_arxiv_metadata, fetch_arxiv_paper
+)
+
+
+def _mock_response(payload: bytes):
+    """Build a streamed requests response whose raw body is the given bytes."""
+    response = Mock()
+    response.raw = io.BytesIO(payload)
+    return response
+
+
+ARXIV_API_RESPONSE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <entry>
+    <title>Attention Is All
+      You Need</title>
+    <author><name>Ashish Vaswani</name></author>
+    <summary>The dominant sequence transduction models...</summary>
+    <category term="cs.CL"/>
+  </entry>
+</feed>
+"""
+
+
+@pytest.fixture
+def metadata_cache(tmp_path):
+    """Replace the module-level metadata cache with one in a temporary directory."""
+    cache = DiskCache(tmp_path / 'arxiv_metadata.sqlite')
+    with patch('sota_agent.utils.fetcher._METADATA_CACHE', cache):
+        yield cache
+    cache.close()
+
+
+@pytest.fixture
+def tar_gz_payload():
+    """A gzipped tarball containing a main .tex file and a section file."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for name, content in [('paper.tex', b'\\documentclass{article}\n\\input{intro}'),
+                              ('intro.tex', b'\\section{Introduction}\n' * 100)]:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class TestDownloadArxivSource:
+    """Test suite for streamed arXiv source extraction."""
+
+    @patch('sota_agent.utils.fetcher.requests.get')
+    def test_extracts_tarball(self, mock_get, tmp_path, tar_gz_payload):
+        """Test that a gzipped tarball is extracted into the source directory."""
+        mock_get.return_value = _mock_response(tar_gz_payload)
+
+        source_dir = download_arxiv_source('2101.00001', tmp_path)
+
+        assert source_dir == tmp_path / '2101.00001'
+        assert (source_dir / 'paper.tex').read_bytes().startswith(b'\\documentclass')
+        assert (source_dir / 'intro.tex').read_bytes() == b'\\section{Introduction}\n' * 100
+
+    @patch('sota_agent.utils.fetcher.requests.get')
+    def test_extracts_single_gzipped_tex(self, mock_get, tmp_path):
+        """Test that a single gzipped .tex file is saved as main.tex."""
+        content = b'\\documentclass{article}\n\\begin{document}\nHello\n\\end{document}\n'
+        mock_get.return_value = _mock_response(gzip.compress(content))
+
+        source_dir = download_arxiv_source('2101.00002', tmp_path)
+
+        assert (source_dir / 'main.tex').read_bytes() == content
+
+    @patch('sota_agent.utils.fetcher.requests.get')
+    def test_invalid_payload_leaves_no_partial_source(self, mock_get, tmp_path):
+        """Test that a non-gzip payload fails cleanly without a leftover directory."""
+        mock_get.return_value = _mock_response(b'%PDF-1.5 not a source archive')
+
+        assert download_arxiv_source('2101.00003', tmp_path) is None
+        assert not (tmp_path / '2101.00003').exists()
+
+
+class TestFetchArxivPaper:
+    """Test suite for the combined source + metadata fetch."""
+
+    @patch('sota_agent.utils.fetcher.fetch_arxiv_metadata', return_value=None)
+    @patch('sota_agent.utils.fetcher.requests.get')
+    def test_temporary_source_leaves_no_files(self, mock_get, mock_metadata, tmp_path, tar_gz_payload):
+        """Test that keep_source=False returns the text without writing anything to output_dir."""
+        mock_get.return_value = _mock_response(tar_gz_payload)
+
+        result = fetch_arxiv_paper('2101.00001', tmp_path, tmp_path, keep_source=False)
+
+        assert result['text'].startswith('\\documentclass')
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestFetchArxivMetadata:
+    """Test suite for ArXiv API metadata fetching."""
+
+    @patch('sota_agent.utils.fetcher.requests.get')
+    def test_parses_api_response(self, mock_get, metadata_cache):
+        """Test that the Atom response is parsed into a metadata dict."""
+        mock_get.return_value = Mock(content=ARXIV_API_RESPONSE)
+
+        metadata = fetch_arxiv_metadata('1706.03762')
+
+        assert metadata['title'] == 'Attention Is All You Need'
+        assert metadata['authors'] == ['Ashish Vaswani']
+        assert metadata['categories'] == ['cs.CL']
+
+    @patch('sota_agent.utils.fetcher.requests.get')
+    def test_second_fetch_served_from_cache(self, mock_get, metadata_cache):
+        """Test that a repeated fetch does not hit the API again."""
+        mock_get.return_value = Mock(content=ARXIV_API_RESPONSE)
+
+        first = fetch_arxiv_metadata('1706.03762')
+        second = fetch_arxiv_metadata('arxiv:1706.03762')
+
+        assert mock_get.call_count == 1
+        assert second == first
+
+    @patch('sota_agent.utils.fetcher.requests.get')
+    def test_failures_are_not_cached(self, mock_get, metadata_cache):
+        """Test that failed fetches are retried on the next call."""
+        mock_get.side_effect = Exception("503 Service Unavailable")
+
+        assert fetch_arxiv_metadata('1706.03762') is None
+        assert fetch_arxiv_metadata('1706.03762') is None
+        assert mock_get.call_count == 2
+
+    @patch('sota_agent.utils.fetcher.requests.get')
+    def test_unwritable_cache_dir_still_returns_metadata(self, mock_get, tmp_path, monkeypatch):
+        """Test that a cache directory that cannot be created only disables caching."""
+        (tmp_path / 'not_a_dir').write_bytes(b'')
+        monkeypatch.setenv('SOTA_AGENT_CACHE_DIR', str(tmp_path / 'not_a_dir' / 'cache'))
+        monkeypatch.setattr('sota_agent.utils.fetcher._METADATA_CACHE',
+                            DiskCache(default_cache_dir() / 'arxiv_metadata.sqlite'))
+        mock_get.return_value = Mock(content=ARXIV_API_RESPONSE)
+
+        metadata = fetch_arxiv_metadata('1706.03762')
+
+        assert metadata['title'] == 'Attention Is All You Need'
+
+
+class TestExtractTextFromLatex:
+    """Test suite for LaTeX text extraction."""
+
+    def test_resolves_nested_inputs(self, tmp_path):
+        """Test that \\input{} commands are inlined recursively."""
+        (tmp_path / 'main.tex').write_text('\\begin{document}\n\\input{intro}\n\\input{missing}\n\\end{document}')
+        (tmp_path / 'intro.tex').write_text('Intro text\n\\input{sections/method.tex}')
+        (tmp_path / 'sections').mkdir()
+        (tmp_path / 'sections' / 'method.tex').write_text('Method text')
+
+        text = extract_text_from_latex(tmp_path / 'main.tex')
+
+        assert text == '\\begin{document}\nIntro text\nMethod text\n\\input{missing}\n\\end{document}'
+
+    def test_text_without_inputs_is_returned_unchanged(self, tmp_path):
+        """Test that text with no \\input commands skips the regex pass entirely."""
+        text = '\\section{Intro}\n' * 1000
+
+        with patch('sota_agent.utils.fetcher._INPUT_RE') as mock_re:
+            assert _resolve_latex_inputs(text, tmp_path) is text
+            mock_re.sub.assert_not_called()
+
@@ -1,8 +1,10 @@
+import json
+import time
 import pytest
+from dataclasses import dataclass
 from unittest.mock import Mock
 
-from sota_agent.filter import filter_papers
-from sota_agent.model.pdf_paper import ArxivPdfPaper
+from sota_agent.filter import _build_keyword_matcher, _keyword_automaton, filter_papers, filter_papers_mask
 
 
 @pytest.fixture
@@ -14,30 +16,45 @@ def mock_config():
     }
 
 
-@pytest.fixture
-def mock_paths(tmp_path):
-    """Mock paths using temporary directory."""
+@pytest.fixture(scope="module")
+def mock_paths(tmp_path_factory):
+    """Mock paths using a temporary directory shared by the module's tests."""
     return {
-        'OUTPUT': tmp_path / 'output'
+        'OUTPUT': tmp_path_factory.mktemp('filter_out')
     }
 
 
+@dataclass(frozen=True, slots=True)
+class StubPaper:
+    """Stand-in for ArxivPdfPaper exposing only what filter_papers uses; far cheaper than a Mock."""
+    text: str
+    meta: dict
+
+    def get_raw_text(self) -> str:
+        return self.text
+
+    def to_dict(self, include_text: bool = False) -> dict:
+        return {**self.meta, 'raw_text': self.text} if include_text else self.meta
+
+
 @pytest.fixture
 def sample_pdf_papers():
     """Create sample PDF paper objects."""
-    paper1 = Mock(spec=ArxivPdfPaper)
-    paper1.get_raw_text.return_value = "This paper discusses machine learning techniques."
-    paper1.to_dict.return_value = {'id': '1', 'title': 'ML Paper'}
-    
-    paper2 = Mock(spec=ArxivPdfPaper)
-    paper2.get_raw_text.return_value = "This paper is about quantum computing."
-    paper2.to_dict.return_value = {'id': '2', 'title': 'QC Paper'}
-    
-    paper3 = Mock(spec=ArxivPdfPaper)
-    paper3.get_raw_text.return_value = "Deep neural network architectures are explored."
-    paper3.to_dict.return_value = {'id': '3', 'title': 'NN Paper'}
-    
-    return [paper1, paper2, paper3]
+    return [
+        StubPaper("This paper discusses machine learning techniques.", {'id': '1', 'title': 'ML Paper'}),
+        StubPaper("This paper is about quantum computing.", {'id': '2', 'title': 'QC Paper'}),
+        StubPaper("Deep neural network architectures are explored.", {'id': '3', 'title': 'NN Paper'}),
+    ]
+
+
+@pytest.fixture
+def large_pdf_papers():
+    """10,000 paper stubs with paragraph-sized text; every 100th mentions the target keyword."""
+    filler = "We study robustness of image classifiers under distribution shift. " * 20
+    return [
+        StubPaper(filler + ("Results on Waterbirds." if i % 100 == 0 else "Results on ImageNet."), {'id': str(i)})
+        for i in range(10_000)
+    ]
 
 
 class TestFilter:
@@ -60,11 +77,11 @@ class TestFilter:
 
     def test_filter_papers_case_insensitive(self, mock_paths, sample_pdf_papers):
         """Test that keyword matching is case-insensitive."""
-        config = {'content_keywords': ['MACHINE LEARNING']}
+        config = {'content_keywords': ['MACHINE LEARNING', 'Neural Network']}
         
         result = filter_papers(config, sample_pdf_papers, mock_paths)
         
-        assert len(result) >= 1
+        assert result == [sample_pdf_papers[0], sample_pdf_papers[2]]
 
     def test_filter_papers_no_matches(self, mock_paths, sample_pdf_papers):
         """Test filtering with keywords that match nothing."""
@@ -79,9 +96,93 @@ class TestFilter:
             'content_keywords': ['machine learning', 'neural network'],
             'preview_filtered_papers': True
         }
+        # The output directory is shared across the module, so drop any earlier preview
+        preview_path = mock_paths['OUTPUT'] / "filtered_papers_preview.json"
+        preview_path.unlink(missing_ok=True)
         
         result = filter_papers(config, sample_pdf_papers, mock_paths)
         
-        # Check that preview file would be created
-        preview_path = mock_paths['OUTPUT'] / "filtered_papers_preview.json"
+        # Check that preview file would be created, with the extracted text of each paper
         assert preview_path.exists()
+        preview = json.loads(preview_path.read_text(encoding='utf-8'))
+        assert [paper['raw_text'] for paper in preview] == [paper.text for paper in result]
+
+    def test_filter_papers_many_keywords(self, mock_paths, sample_pdf_papers):
+        """Test that matching still works with a large keyword list."""
+        config = {'content_keywords': [f'unrelated term {i}' for i in range(1000)] + ['Quantum Computing']}
+
+        result = filter_papers(config, sample_pdf_papers, mock_paths)
+
+        assert result == [sample_pdf_papers[1]]
+
+    def test_filter_papers_mask(self, mock_config, sample_pdf_papers):
+        """Test that the mask lines up with the input papers."""
+        mask = filter_papers_mask(mock_config, sample_pdf_papers)
+
+        assert mask.dtype == bool
+        assert mask.tolist() == [True, False, True]
+        assert filter_papers_mask({'content_keywords': []}, sample_pdf_papers).all()
+
+    @pytest.mark.parametrize('use_automaton', [True, False])
+    def test_keyword_matcher_backends(self, monkeypatch, use_automaton):
+        """Test that the Aho-Corasick and plain substring matchers agree."""
+        if use_automaton:
+            pytest.importorskip('ahocorasick')
+        else:
+            monkeypatch.setattr('sota_agent.filter.ahocorasick', None)
+
+        matches = _build_keyword_matcher(['Waterbirds', 'CelebA'])
+
+        assert matches('results on waterbirds and imagenet')
+        assert matches('celeba')
+        assert not matches('water birds')
+
+    @pytest.mark.parametrize('keywords', [[''], ['', 'CelebA']])
+    def test_empty_keyword_matches_everything(self, monkeypatch, keywords):
+        """Test that an empty keyword matches any text and skips the automaton even when it is available."""
+        fake_ahocorasick = Mock()
+        monkeypatch.setattr('sota_agent.filter.ahocorasick', fake_ahocorasick)
+
+        matches = _build_keyword_matcher(keywords)
+
+        assert matches('results on waterbirds')
+        fake_ahocorasick.Automaton.assert_not_called()
+
+    def test_keyword_automaton_reused_across_calls(self):
+        """Test that the same keywords in a different order and case reuse the compiled automaton."""
+        pytest.importorskip('ahocorasick')
+        _keyword_automaton.cache_clear()
+
+        _build_keyword_matcher(['Waterbirds', 'CelebA'])
+        matches = _build_keyword_matcher(['celeba', 'WATERBIRDS'])
+
+        assert _keyword_automaton.cache_info().misses == 1
+        assert _keyword_automaton.cache_info().hits == 1
+        assert matches('results on waterbirds')
+
+    def test_filter_papers_parallel_keeps_order(self, mock_config, mock_paths, sample_pdf_papers):
+        """Test that threaded filtering returns the same papers in input order."""
+        papers = sample_pdf_papers * 4
+
+        serial = filter_papers(mock_config, papers, mock_paths)
+        parallel = filter_papers({**mock_config, 'filter_workers': 3}, papers, mock_paths)
+
+        assert parallel == serial == [p for p in papers if p is not sample_pdf_papers[1]]
+
+    @pytest.mark.benchmark
+    def test_filter_latency_sublinear_in_keywords(self, mock_paths, large_pdf_papers):
+        """Test that 100x more keywords takes less than 10x the filtering time with Aho-Corasick."""
+        pytest.importorskip('ahocorasick')
+
+        def timed_filter(n_keywords):
+            config = {'content_keywords': [f'unrelated term {i}' for i in range(n_keywords - 1)] + ['Waterbirds']}
+            start = time.perf_counter()
+            result = filter_papers(config, large_pdf_papers, mock_paths)
+            return time.perf_counter() - start, result
+
+        few_time, few_result = timed_filter(10)
+        many_time, many_result = timed_filter(1000)
+
+        assert many_result == few_result
+        assert len(few_result) == 100
+        assert many_time < 10 * few_time
@@ -0,0 +1,55 @@
+import os
+import yaml
+import pytest
+from unittest.mock import patch
+
+from sota_agent.utils.loader import load_config, _load_config_cached
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Write a small YAML config to a temporary file."""
+    path = tmp_path / 'config.yaml'
+    path.write_text("STEP:\n  max_calls: 5\n  keywords: ['a', 'b']\n")
+    return path
+
+
+class TestLoadConfig:
+    """Test suite for YAML config loading."""
+
+    def test_load_config_parses_yaml(self, config_file):
+        """Test that the YAML file is parsed into a dict."""
+        config = load_config(config_file)
+
+        assert config == {'STEP': {'max_calls': 5, 'keywords': ['a', 'b']}}
+
+    def test_load_config_missing_file(self, tmp_path):
+        """Test that a missing config raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_config(tmp_path / 'missing.yaml')
+
+    def test_load_config_parses_once(self, config_file):
+        """Test that repeated loads of an unchanged file reuse the cached parse."""
+        _load_config_cached.cache_clear()
+
+        with patch('sota_agent.utils.loader.yaml.load', wraps=yaml.load) as mock_load:
+            load_config(config_file)
+            load_config(config_file)
+
+        assert mock_load.call_count == 1
+
+    def test_load_config_returns_independent_copies(self, config_file):
+        """Test that mutating a loaded config does not leak into later loads."""
+        config = load_config(config_file)
+        config['STEP']['max_calls'] = -1
+
+        assert load_config(config_file)['STEP']['max_calls'] == 5
+
+    def test_load_config_reloads_after_edit(self, config_file):
+        """Test that a modified file is re-parsed."""
+        load_config(config_file)
+        config_file.write_text("STEP:\n  max_calls: 7\n")
+        stat = config_file.stat()
+        os.utime(config_file, (stat.st_atime, stat.st_mtime + 10))
+
+        assert load_config(config_file)['STEP']['max_calls'] == 7
@@ -0,0 +1,69 @@
+import pytest
+
+from sota_agent.utils import pdf_fetcher
+from sota_agent.utils.pdf_fetcher import extract_text_from_pdf
+
+
+def _text_pdf(n_pages: int) -> bytes:
+    """Build a minimal PDF whose page i (1-based) shows the text 'Page i'."""
+    n_objects = 3 + 2 * n_pages
+    kids = ' '.join(f'{4 + 2 * i} 0 R' for i in range(n_pages))
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        f'<< /Type /Pages /Kids [{kids}] /Count {n_pages} >>'.encode(),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for i in range(n_pages):
+        stream = f'BT /F1 24 Tf 72 720 Td (Page {i + 1}) Tj ET'.encode()
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>'.encode())
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+
+    pdf = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref_offset = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (n_objects + 1)
+    pdf += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    pdf += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (n_objects + 1, xref_offset)
+    return bytes(pdf)
+
+
+@pytest.fixture(scope="module")
+def five_page_pdf(tmp_path_factory):
+    """A 5-page PDF with one line of text per page, written once and shared read-only by the module."""
+    pdf_path = tmp_path_factory.mktemp('pdfs') / '2101.00001.pdf'
+    pdf_path.write_bytes(_text_pdf(5))
+    return pdf_path
+
+
+class TestExtractTextFromPdf:
+    """Test suite for PDF text extraction with either backend."""
+
+    @pytest.mark.parametrize('use_pymupdf', [True, False])
+    @pytest.mark.parametrize('max_pages, expected_pages', [(3, [1, 2, 3]), (10, [1, 2, 3, 4, 5])])
+    def test_extracts_first_pages(self, five_page_pdf, monkeypatch, use_pymupdf, max_pages, expected_pages):
+        """Test that only the first max_pages pages are extracted, in order."""
+        if use_pymupdf:
+            pytest.importorskip('pymupdf')
+        else:
+            monkeypatch.setattr(pdf_fetcher, 'pymupdf', None)
+
+        text = extract_text_from_pdf(five_page_pdf, max_pages=max_pages)
+
+        assert text.split() == [word for page in expected_pages for word in ('Page', str(page))]
+
+    def test_backends_agree(self, five_page_pdf, monkeypatch):
+        """Test that PyMuPDF and PyPDF2 extract the same words."""
+        pytest.importorskip('pymupdf')
+        pymupdf_text = extract_text_from_pdf(five_page_pdf, max_pages=4)
+        monkeypatch.setattr(pdf_fetcher, 'pymupdf', None)
+        pypdf2_text = extract_text_from_pdf(five_page_pdf, max_pages=4)
+
+        assert pymupdf_text.split() == pypdf2_text.split()
+
+    def test_missing_pdf_returns_empty_text(self, tmp_path):
+        """Test that a missing file yields empty text instead of raising."""
+        assert extract_text_from_pdf(tmp_path / 'missing.pdf') == ""
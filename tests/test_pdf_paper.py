@@ -0,0 +1,113 @@
+import PyPDF2
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+
+from sota_agent.model.pdf_paper import ArxivPdfPaper
+from sota_agent.utils import json_backend
+
+
+@pytest.fixture(scope="module")
+def ten_page_pdf(tmp_path_factory):
+    """A blank 10-page PDF on disk, written once and shared read-only by the module."""
+    writer = PyPDF2.PdfWriter()
+    for _ in range(10):
+        writer.add_blank_page(width=612, height=792)
+    pdf_path = tmp_path_factory.mktemp('pdfs') / '2101.00001.pdf'
+    with open(pdf_path, 'wb') as f:
+        writer.write(f)
+    return pdf_path
+
+
+@pytest.fixture
+def saved_paper():
+    """A paper with metadata, extracted text and upload state."""
+    paper = ArxivPdfPaper('2101.00001', pdf_path=Path('pdfs/2101.00001.pdf'),
+                          metadata={'title': 'Robustness à la carte', 'authors': ['A. Author']})
+    paper.raw_text = 'Worst-group accuracy on Waterbirds: 91.5%'
+    paper.gemini_file_uri = 'files/abc'
+    paper.downloaded_date = '2024-01-01T00:00:00'
+    return paper
+
+
+def page_counting_client():
+    """A mock genai client that records the page count of each uploaded file."""
+    client = Mock()
+    client.uploaded_pages = []
+
+    def upload(file):
+        client.uploaded_pages.append((Path(file), len(PyPDF2.PdfReader(file).pages)))
+        return Mock(uri=f'uri-{len(client.uploaded_pages)}')
+
+    client.files.upload.side_effect = upload
+    return client
+
+
+class TestArxivPdfPaper:
+    """Test suite for ArxivPdfPaper."""
+
+    @pytest.mark.parametrize('max_pages, expected_pages', [(3, 3), (10, 10), (20, 10), (None, 10), (0, 10), (-2, 10)])
+    def test_upload_respects_max_pages(self, ten_page_pdf, max_pages, expected_pages):
+        """Test that long PDFs are truncated to a temporary copy and short ones uploaded as-is."""
+        paper = ArxivPdfPaper('2101.00001', pdf_path=ten_page_pdf)
+        client = page_counting_client()
+
+        paper.upload_to_gemini(client, max_pages=max_pages)
+
+        uploaded_path, n_pages = client.uploaded_pages[0]
+        assert n_pages == expected_pages
+        if expected_pages < 10:
+            assert uploaded_path != ten_page_pdf
+            assert not uploaded_path.exists()
+        else:
+            assert uploaded_path == ten_page_pdf
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_json_round_trip(self, saved_paper, tmp_path, monkeypatch, use_orjson):
+        """Test that save_to_json/from_json round-trip with either JSON backend."""
+        if use_orjson:
+            pytest.importorskip('orjson')
+        else:
+            monkeypatch.setattr(json_backend, 'orjson', None)
+        json_path = tmp_path / 'parsed' / '2101.00001.json'
+
+        saved_paper.save_to_json(json_path)
+        loaded = ArxivPdfPaper.from_json(json_path)
+
+        assert loaded.to_dict(include_text=True) == saved_paper.to_dict(include_text=True)
+        assert 'Robustness à la carte' in json_path.read_text(encoding='utf-8')
+
+    def test_raw_text_stored_beside_json_and_loaded_lazily(self, saved_paper, tmp_path):
+        """Test that raw_text lives in a sibling .txt file and is only read on access."""
+        json_path = tmp_path / '2101.00001.json'
+        saved_paper.save_to_json(json_path)
+
+        assert 'raw_text' not in json_backend.loads(json_path.read_bytes())
+        assert (tmp_path / '2101.00001.txt').read_text(encoding='utf-8') == saved_paper.raw_text
+
+        loaded = ArxivPdfPaper.from_json(json_path)
+        assert loaded._raw_text is None
+        assert loaded.get_raw_text() == saved_paper.raw_text
+
+    def test_to_dict_matches_saved_json(self, saved_paper, tmp_path):
+        """Test that to_dict references the text file the same way the saved JSON does."""
+        json_path = tmp_path / '2101.00001.json'
+        saved_paper.save_to_json(json_path)
+
+        assert saved_paper.to_dict() == json_backend.loads(json_path.read_bytes())
+        assert saved_paper.to_dict()['raw_text_path'] == '2101.00001.txt'
+
+    def test_from_json_with_embedded_raw_text(self, tmp_path):
+        """Test that JSON files written before the text was split out still load."""
+        json_path = tmp_path / '2101.00001.json'
+        json_path.write_bytes(json_backend.dumps({'arxiv_id': '2101.00001', 'raw_text': 'embedded text'}))
+
+        assert ArxivPdfPaper.from_json(json_path).raw_text == 'embedded text'
+
+    def test_no_instance_dict(self):
+        """Test that papers use slots rather than a per-instance __dict__."""
+        paper = ArxivPdfPaper('2101.00001')
+
+        assert not hasattr(paper, '__dict__')
+        with pytest.raises(AttributeError):
+            paper.raw_txt = 'typo'
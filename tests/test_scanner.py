@@ -1,7 +1,8 @@
+import json
 import pytest
 from unittest.mock import patch
 
-from sota_agent.scanner import scan_arxiv_metadata
+from sota_agent.scanner import filter_arxiv_metadata, scan_arxiv_metadata
 
 
 @pytest.fixture
@@ -79,6 +80,33 @@ class TestScanner:
         # Should stop at the limit
         assert len(result) <= 50
 
+    @patch('sota_agent.scanner.stream_arxiv_data')
+    @patch('sota_agent.scanner.filter_arxiv_metadata')
+    def test_scan_stops_reading_at_limit(
+        self, mock_filter, mock_stream, mock_config, mock_paths
+    ):
+        """Test that the data stream is not read past the limit and is closed early."""
+        yielded, closed = 0, False
+
+        def counting_stream(*args, **kwargs):
+            nonlocal yielded, closed
+            try:
+                for i in range(200):
+                    yielded += 1
+                    yield {'id': f'210{i}'}
+            finally:
+                closed = True
+
+        mock_stream.side_effect = counting_stream
+        mock_filter.return_value = True
+        mock_config['max_metadata_scan_limit'] = 50
+
+        result = scan_arxiv_metadata(mock_config, mock_paths)
+
+        assert len(result) == 50
+        assert yielded == 50
+        assert closed
+
     @patch('sota_agent.scanner.stream_arxiv_data')
     def test_scan_with_missing_data_file(self, mock_stream, mock_config, mock_paths):
         """Test handling of missing data file."""
@@ -112,3 +140,93 @@ class TestScanner:
         result = scan_arxiv_metadata(mock_config, mock_paths)
         
         assert len(result) == len(sample_papers)
+
+    @pytest.mark.parametrize('use_vectorized', [False, True])
+    def test_any_negative_limit_scans_everything(self, mock_paths, sample_papers, use_vectorized):
+        """Test that negative limits other than -1 also mean no limit."""
+        mock_paths['DATA'].write_text(''.join(json.dumps(p) + '\n' for p in sample_papers * 5))
+        config = {'max_metadata_scan_limit': -5, 'use_vectorized': use_vectorized, 'allowed_categories': ['cs.LG']}
+
+        result = scan_arxiv_metadata(config, mock_paths)
+
+        assert len(result) == 5
+
+    def test_sharded_scan_matches_sequential(self, mock_paths, sample_papers):
+        """Test that a parallel sharded scan finds the same candidates in file order."""
+        mock_paths['DATA'].write_text(''.join(json.dumps(p) + '\n' for p in sample_papers * 20))
+        config = {'max_metadata_scan_limit': -1, 'allowed_categories': ['cs.LG']}
+
+        sequential = scan_arxiv_metadata({**config, 'scan_workers': 1}, mock_paths)
+        sharded = scan_arxiv_metadata({**config, 'scan_workers': 3}, mock_paths)
+
+        assert len(sharded) == len(sequential) == 20
+        assert list(sharded) == list(sequential)
+
+    def test_vectorized_scan_matches_sequential(self, mock_paths):
+        """Test that the pandas scan applies the same criteria as filter_arxiv_metadata."""
+        records = [
+            {'id': '2101.00001', 'title': 'Spurious Correlation Robustness', 'abstract': 'We study groups.',
+             'categories': 'cs.LG stat.ML', 'update_date': '2021-01-01', 'doi': '10.1/x', 'authors': 'A'},
+            {'id': '2101.00002', 'title': 'A Survey of Spurious Correlation', 'abstract': '',
+             'categories': 'cs.LG', 'update_date': '2021-01-01', 'doi': '10.1/y'},
+            {'id': '2101.00003', 'title': 'Vision', 'abstract': 'Mitigating SPURIOUS CORRELATION.',
+             'categories': 'cs.CV', 'update_date': '2021-01-01', 'doi': '10.1/z'},
+            {'id': '1401.00004', 'title': 'Old', 'abstract': 'spurious correlation',
+             'categories': 'cs.LG', 'update_date': '2014-01-01', 'doi': '10.1/w'},
+            {'id': '2101.00005', 'title': 'No date', 'abstract': 'spurious correlation',
+             'categories': 'cs.LGX cs.AI', 'doi': '10.1/v'},
+            {'id': '2101.00006', 'title': 'Bad date', 'abstract': 'spurious correlation',
+             'categories': 'cs.AI', 'update_date': 'yesterday', 'doi': '10.1/u'},
+            {'id': '2101.00007', 'title': 'Unpublished', 'abstract': 'spurious correlation',
+             'categories': 'cs.AI', 'update_date': '2022-05-05', 'doi': None},
+            {'id': '2101.00008', 'title': 'Off topic', 'abstract': 'image classification',
+             'categories': 'cs.AI', 'update_date': '2022-05-05', 'doi': '10.1/t'},
+        ]
+        mock_paths['DATA'].write_text(''.join(json.dumps(r) + '\n' for r in records))
+        config = {
+            'max_metadata_scan_limit': -1,
+            'scan_workers': 1,
+            'allowed_categories': ['cs.LG', 'stat.ML', 'cs.AI'],
+            'min_date': '2015-01-01',
+            'is_published': True,
+            'exclude_title_keywords': ['survey'],
+            'title_abstract_keywords': ['Spurious Correlation'],
+        }
+
+        sequential = scan_arxiv_metadata(config, mock_paths)
+        vectorized = scan_arxiv_metadata({**config, 'use_vectorized': True}, mock_paths)
+
+        assert [row['id'] for row in sequential] == ['2101.00001', '2101.00005']
+        assert list(vectorized) == list(sequential)
+
+    def test_vectorized_scan_respects_max_limit(self, mock_paths, sample_papers):
+        """Test that the vectorized scan stops after max_metadata_scan_limit records across chunks."""
+        mock_paths['DATA'].write_text(''.join(json.dumps(p) + '\n' for p in sample_papers * 50))
+        config = {'max_metadata_scan_limit': 15, 'use_vectorized': True, 'allowed_categories': ['cs.LG']}
+
+        with patch('sota_agent.scanner._VECTORIZED_CHUNK_SIZE', 4):
+            result = scan_arxiv_metadata(config, mock_paths)
+
+        # every other record is cs.LG
+        assert len(result) == 8
+
+
+class TestFilterArxivMetadata:
+    """Test suite for per-record metadata filtering."""
+
+    @pytest.mark.parametrize('paper, expected', [
+        ({'categories': 'cs.CV stat.ML', 'title': 'Group Robustness', 'abstract': 'SPURIOUS Correlations.'}, True),
+        ({'categories': 'cs.LG', 'title': 'Spurious correlation', 'abstract': ''}, True),
+        ({'categories': 'cs.LG', 'title': 'A Survey of Spurious Correlation', 'abstract': ''}, False),
+        ({'categories': 'cs.LGX', 'title': 'Spurious correlation', 'abstract': ''}, False),
+        ({'categories': 'cs.LG', 'title': 'Shortcut learning', 'abstract': 'spurious features'}, False),
+    ])
+    def test_filter_criteria(self, paper, expected):
+        """Test category, title exclusion and case-insensitive keyword checks."""
+        config = {
+            'allowed_categories': ['cs.LG', 'stat.ML'],
+            'exclude_title_keywords': ['survey'],
+            'title_abstract_keywords': ['Spurious Correlation', 'group shift'],
+        }
+
+        assert filter_arxiv_metadata(paper, config) is expected